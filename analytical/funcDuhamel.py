@@ -0,0 +1,66 @@
+"""
+Function to return the temperature at a dimensionless point (r) in a 1D solid
+sphere, cylinder, or slab when the surrounding fluid temperature Tinf changes
+with time. The convection solution of funcTheta is the response to a step in
+Tinf so Duhamel's theorem gives the response to any Tinf(Fo) as
+
+    T(r, Fo) = Tinf(Fo) - sum( Cn * Dn(r) * yn(Fo) )
+    yn(Fo) = (Tinf(0) - Ti)*exp(-zn^2*Fo) + int( exp(-zn^2*(Fo-s)) dTinf(s) )
+
+For Tinf linear between the given points each yn is updated recursively as
+
+    yn = exp(-zn^2*dFo)*yn + (dTinf/dFo)*(1 - exp(-zn^2*dFo))/zn^2
+
+so every time step costs O(number of roots). A heat flux q into the surface
+in addition to convection is the same as an ambient temperature Tinf + q/h.
+
+References:
+1) Recktenwald 2006
+2) Bergman, Lavine, Incropera, Dewitt 2011 from Ch. 5, pg.299-304
+3) Ozisik 1993, Ch.1, Duhamel's theorem
+"""
+
+# Modules and Other Required Functions
+#------------------------------------------------------------------------------
+
+import numpy as np
+from funcRoots import roots
+from funcTheta import funcCn, funcDn
+
+# Duhamel Function
+#------------------------------------------------------------------------------
+
+def duhamel(r, b, z, Bi, Fo, Ti, Tinf):
+    """
+    Temperature for the analytical solution of 1D transient heat conduction
+    for a solid sphere, cylinder, or slab with time-varying Tinf. Returns an
+    array with one row for each Fo and one column for each r.
+    r = dimensionaless length terms to evaluate T, (-)
+    b = shape factor where 2 sphere or 1 cylinder or 0 slab, (-)
+    z = range of zeta values to evaluate zeta, Bi equation for positive roots
+    Bi = Biot number h*L/k, (-)
+    Fo = increasing Fourier numbers alpha*t/L^2 starting at Fo = 0, (-)
+    Ti = uniform initial temperature, K
+    Tinf = surrounding fluid temperature at each Fo, K
+    """
+    rts = roots(z, b, Bi)   # positive roots of the zeta, Bi equation
+    r = np.atleast_1d(r)
+    Tinf = np.broadcast_to(np.asarray(Tinf, dtype=float), np.shape(Fo))
+
+    # Cn*Dn for every root (rows) and every r (columns)
+    CD = funcCn(rts, b)[:, np.newaxis]*funcDn(r[np.newaxis, :],
+                                              rts[:, np.newaxis], b)
+    z2 = rts**2
+
+    T = np.zeros((len(Fo), len(r)))
+    y = (Tinf[0] - Ti)*np.ones(len(rts))    # step in Tinf at Fo = 0
+    T[0] = Tinf[0] - y @ CD
+
+    for i in range(1, len(Fo)):
+        dFo = Fo[i] - Fo[i-1]
+        e = np.exp(-z2*dFo)
+        slope = (Tinf[i] - Tinf[i-1]) / dFo
+        y = e*y + slope*(1 - e)/z2
+        T[i] = Tinf[i] - y @ CD
+
+    return T
@@ -0,0 +1,132 @@
+"""
+Functions to return theta (dimensionless temperature) in a finite cylinder or
+a rectangular prism (including a cube) as the product of the 1D analytical
+solutions for an infinite cylinder and a plane wall (slab).
+
+finite cylinder:
+    theta = theta_cyl(r/ro, Fo_r, Bi_r) * theta_slab(x/L, Fo_x, Bi_x)
+rectangular prism:
+    theta = theta_slab(x1/L1) * theta_slab(x2/L2) * theta_slab(x3/L3)
+
+where L is the half-thickness, x is measured from the center plane and each
+Fo and Bi are based on the length of that direction. The positive roots for
+each (b, Bi) are cached so repeated calls only evaluate the series, and each
+1D solution is evaluated for all times and points as one matrix product. The
+number of roots follows the smallest Fo, every term with
+exp(-root^2*Fo) >= 1e-12 is kept.
+
+Functions:
+funcRoots.py returns the positive roots of the zeta, Bi equation
+funcTheta.py returns the first and second terms of the theta function
+funcProduct <- funcTheta, funcRoots
+
+References:
+1) Bergman, Lavine, Incropera, Dewitt 2011 from Ch. 5, pg.307-310
+2) Recktenwald 2006
+"""
+
+# Modules and Other Required Functions
+#------------------------------------------------------------------------------
+
+import functools
+import numpy as np
+from funcRoots import rootsArray
+from funcTheta import funcCn, funcDn
+
+nroots = 64     # least number of roots of the series
+
+# Cached 1D Modal Solution
+#------------------------------------------------------------------------------
+
+def count(Fo):
+    """
+    Returns the number of roots that keeps every term with
+    exp(-root^2*Fo) >= 1e-12 at the smallest Fo > 0, rounded up to a power of
+    two so similar Fo share the cached roots. Root j is larger than (j-1)*pi
+    for the slab and cylinder.
+    Fo = Fourier numbers alpha*t/L^2, (-)
+    """
+    pos = Fo[Fo > 0]
+    if len(pos) == 0:
+        return nroots
+    n = np.sqrt(28/pos.min())/np.pi + 2
+    return max(nroots, 2**int(np.ceil(np.log2(n))))
+
+@functools.lru_cache(maxsize=256)
+def cachedModes(b, Bi, n=nroots):
+    """
+    Returns the first n positive roots and the first terms Cn for a shape and
+    Biot number, cached for repeated calls.
+    b = shape factor where 1 cylinder, 0 slab
+    Bi = Biot number h*L/k, (-)
+    n = number of roots
+    """
+    # each root is bracketed so no root near a pole of the zeta, Bi equation
+    # is missed
+    rts = rootsArray(n, b, Bi)[0]
+    return rts, funcCn(rts, b)
+
+def theta1D(r, b, Bi, Fo):
+    """
+    Returns the 1D theta with shape (len(Fo), len(r)) for a cylinder or slab.
+    r = dimensionless length terms to evaluate theta, (-)
+    b = shape factor where 1 cylinder, 0 slab
+    Bi = Biot number h*L/k, (-)
+    Fo = Fourier numbers alpha*t/L^2, (-)
+    """
+    Fo = np.atleast_1d(Fo)
+    r = np.atleast_1d(r)
+    rts, Cn = cachedModes(b, float(Bi), count(Fo))
+
+    # drop the roots with exp(-root^2*Fo) < 1e-12 at the smallest Fo > 0
+    pos = Fo > 0
+    if pos.any():
+        keep = rts**2 * Fo[pos].min() < 28
+        rts = rts[keep]
+        Cn = Cn[keep]
+
+    E = np.exp(-np.outer(Fo, rts**2))
+    D = funcDn(r[np.newaxis, :], rts[:, np.newaxis], b)
+    th = E @ (Cn[:, np.newaxis]*D)
+    th[~pos] = 1    # uniform initial temperature at Fo = 0
+    return th
+
+# Product Solutions
+#------------------------------------------------------------------------------
+
+def finiteCylinder(r, x, t, ro, L, h, k, alpha):
+    """
+    Returns theta in a finite cylinder with shape (len(t), number of points).
+    r = radial position of each point from the axis, m
+    x = axial position of each point from the center plane, m
+    t = times, s
+    ro = radius of the cylinder, m
+    L = half-height of the cylinder, m
+    h = heat transfer coefficient, W/m^2*K
+    k = thermal conductivity, W/m*K
+    alpha = thermal diffusivity, m^2/s
+    """
+    t = np.atleast_1d(t)
+    r, x = np.broadcast_arrays(np.atleast_1d(r), np.atleast_1d(x))
+    th_r = theta1D(r/ro, 1, h*ro/k, alpha*t/ro**2)
+    th_x = theta1D(np.abs(x)/L, 0, h*L/k, alpha*t/L**2)
+    return th_r*th_x
+
+def prism(x1, x2, x3, t, L1, L2, L3, h, k, alpha):
+    """
+    Returns theta in a rectangular prism with shape (len(t), number of
+    points), use L1 = L2 = L3 for a cube.
+    x1, x2, x3 = position of each point from the center planes, m
+    t = times, s
+    L1, L2, L3 = half-lengths of the prism sides, m
+    h = heat transfer coefficient, W/m^2*K
+    k = thermal conductivity, W/m*K
+    alpha = thermal diffusivity, m^2/s
+    """
+    t = np.atleast_1d(t)
+    pts = np.broadcast_arrays(np.atleast_1d(x1), np.atleast_1d(x2),
+                              np.atleast_1d(x3))
+    th = 1
+    for xi, Li in zip(pts, (L1, L2, L3)):
+        th = th*theta1D(np.abs(xi)/Li, 0, h*Li/k, alpha*t/Li**2)
+    return th
@@ -1,8 +1,12 @@
 """
-Function that returns the positive roots of the zeta, Bi equation of the
+Functions that return the positive roots of the zeta, Bi equation of the
 analytical solution for 1D transient heat conduction of a sphere, cylinder,
 or slab shape.
 
+roots       - roots found in a range of zeta values for one Bi
+rootsArray  - first n roots for an array of Bi values, all (Bi, n) pairs are
+              solved together by safeguarded Halley iterations
+
 References: 
 1) Recktenwald 2006
 2) Bergman, Lavine, Incropera, Dewitt 2011 from Ch. 5, pg.299-304
@@ -13,7 +17,10 @@ References:
 
 import numpy as np
 import scipy.optimize as op
+import scipy.special as sp
 from funcZeta import funcZetaSph, funcZetaCyl, funcZetaSlab
+from funcZeta import dfuncZetaSph, dfuncZetaCyl, dfuncZetaSlab
+from funcZeta import d2funcZetaSph, d2funcZetaCyl, d2funcZetaSlab
 
 # Roots Function
 #------------------------------------------------------------------------------
@@ -63,3 +70,74 @@ def roots(z, b, Bi):
         
     return roots    # return a list of the positive roots
 
+# Roots for an Array of Biot Numbers
+#------------------------------------------------------------------------------
+
+def rootsArray(n, b, Bi, tol=1e-13, maxit=50):
+    """
+    Returns the first n positive roots of the zeta, Bi equation for every Bi
+    as an array with shape (len(Bi), n). Each root lies in a known interval
+    where the function goes from negative to positive, so a Halley step that
+    leaves the interval is replaced by bisection.
+    n = number of roots for each Bi
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    Bi = array of Biot numbers h*L/k, (-)
+    tol = relative tolerance of the roots
+    maxit = max number of iterations
+    """
+    Bi = np.atleast_1d(np.asarray(Bi, dtype=float))[:, np.newaxis]
+    j = np.arange(n)[np.newaxis, :]
+
+    # interval of each root and analytic initial guess
+    if b == 2:
+        f, df, d2f = funcZetaSph, dfuncZetaSph, d2funcZetaSph
+        lo = j*np.pi + 0*Bi
+        hi = (j+1)*np.pi + 0*Bi
+        x = j*np.pi + np.pi/2 + np.arctan((Bi - 1)/(j*np.pi + np.pi/2))
+        x[:, 0] = np.sqrt(3*Bi[:, 0]/(1 + 3*Bi[:, 0]/np.pi**2))
+    elif b == 1:
+        f, df, d2f = funcZetaCyl, dfuncZetaCyl, d2funcZetaCyl
+        j1z = sp.jn_zeros(1, n-1) if n > 1 else []     # needs n-1 > 0
+        lo = np.concatenate(([0], j1z))[np.newaxis, :] + 0*Bi
+        hi = sp.jn_zeros(0, n)[np.newaxis, :] + 0*Bi
+        x = lo + (hi - lo)*(2/np.pi)*np.arctan(Bi/(lo + 1))
+        x[:, 0] = np.sqrt(2*Bi[:, 0]/(1 + 2*Bi[:, 0]/hi[:, 0]**2))
+    elif b == 0:
+        f, df, d2f = funcZetaSlab, dfuncZetaSlab, d2funcZetaSlab
+        lo = j*np.pi + 0*Bi
+        hi = j*np.pi + np.pi/2 + 0*Bi
+        x = j*np.pi + np.arctan(Bi/(j*np.pi + np.pi/4))
+        x[:, 0] = np.sqrt(Bi[:, 0]/(1 + 4*Bi[:, 0]/np.pi**2))
+
+    # sign of the function just above the lower end of the interval
+    slo = -np.sign(sp.j0(lo)) if b == 1 else -np.ones(lo.shape)
+
+    # iterate only on the (Bi, n) pairs that have not converged
+    shape = x.shape
+    x, lo, hi, slo = [a.ravel().copy() for a in (x, lo, hi, slo)]
+    Bi = np.broadcast_to(Bi, shape).ravel()
+    act = np.arange(x.size)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for it in range(maxit):
+            xa = x[act]
+            Ba = Bi[act]
+            fx = f(xa, Ba)
+            dfx = df(xa, Ba)
+
+            # shrink the interval with the sign of f
+            left = np.sign(fx) == slo[act]
+            lo[act] = np.where(left, xa, lo[act])
+            hi[act] = np.where(left, hi[act], xa)
+
+            # Halley step, bisection if the step leaves the interval
+            xn = xa - 2*fx*dfx / (2*dfx**2 - fx*d2f(xa, Ba))
+            bad = ~((xn >= lo[act]) & (xn <= hi[act]))
+            xn = np.where(bad, (lo[act] + hi[act])/2, xn)
+
+            x[act] = xn
+            act = act[np.abs(xn - xa) > tol*np.abs(xn)]
+            if act.size == 0:
+                break
+
+    return x.reshape(shape)
@@ -0,0 +1,152 @@
+"""
+Precomputed lookup tables of theta (dimensionless temperature) for the
+analytical solution of 1D transient heat conduction in a solid sphere,
+cylinder, and slab. The table holds theta on a grid of (b, log Bi, log Fo, s)
+where r = sin(pi*s/2) clusters the radial points at the surface to resolve the
+thin thermal layer at small Fo and large Bi. The table is saved as a .npy
+file which is opened as a read-only memory map, so any number of processes
+share one copy of the table through the page cache. The grid axes and error
+estimates are saved next to it in a .json file.
+
+Queries use trilinear interpolation in (log Bi, log Fo, s). The interpolation
+error in each cell is bounded by
+
+    |err| <= 1/8 * (ds^2*|theta_ss| + dx^2*|theta_xx| + dy^2*|theta_yy|)
+
+with x = log Fo and y = log Bi. The largest error over all cell centers is
+measured against funcTheta when the table is made and is stored in the .json
+file as err[b], which is the error bound to quote for a given table. Queries
+outside the grid are clamped to the nearest grid edge.
+
+Functions:
+funcTheta.py returns the first and second terms of the theta function
+funcRoots.py returns the positive roots of the zeta, Bi equation
+funcTable <- funcTheta, funcRoots
+
+References:
+1) Recktenwald 2006
+2) Bergman, Lavine, Incropera, Dewitt 2011 from Ch. 5, pg.299-304
+"""
+
+# Modules and Other Required Functions
+#------------------------------------------------------------------------------
+
+import json
+import numpy as np
+from funcRoots import roots
+from funcTheta import funcCn, funcDn
+
+# Theta on a Grid
+#------------------------------------------------------------------------------
+
+def thetaGrid(r, b, z, Bi, Fo):
+    """
+    Returns theta on the grid of r and Fo as an array with shape (nFo, nr),
+    the roots are found once and all points are evaluated together.
+    r = dimensionless length values, (-)
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    z = range of zeta values to evaluate zeta, Bi equation for positive roots
+    Bi = Biot number h*L/k, (-)
+    Fo = Fourier number values alpha*t/L^2, (-)
+    """
+    rts = roots(z, b, Bi)[:, np.newaxis, np.newaxis]
+    r = np.maximum(r, 1e-12)    # prevent divide by zero at the center
+    Cn = funcCn(rts, b)
+    En = np.exp(-rts**2 * Fo[:, np.newaxis])
+    Dn = funcDn(r[np.newaxis, :], rts, b)
+    return (Cn*En*Dn).sum(axis=0)
+
+# Make, Load and Query a Table
+#------------------------------------------------------------------------------
+
+def makeTable(path, nr=65, nFo=128, nBi=64, Fo=(1e-4, 10), Bi=(1e-3, 100),
+              dtype=np.float32):
+    """
+    Evaluates theta for the slab, cylinder and sphere on the grid and writes
+    the table to path.npy and its grid and error estimates to path.json.
+    path = file name without extension
+    nr, nFo, nBi = number of grid points in s, log Fo and log Bi
+    Fo = (min, max) Fourier number of the grid, (-)
+    Bi = (min, max) Biot number of the grid, (-)
+    dtype = storage type of the table
+    """
+    # range to evaluate the zeta, Bi equation, the fine step keeps slab roots
+    # that lie close to a pole of tan(z) at large Bi
+    z = np.arange(0, 1250, 0.01)
+    z[0] = 1e-12                    # prevent divide by zero warning
+
+    s = np.linspace(0, 1, nr)
+    r = np.sin(np.pi*s/2)
+    x = np.linspace(np.log(Fo[0]), np.log(Fo[1]), nFo)
+    y = np.linspace(np.log(Bi[0]), np.log(Bi[1]), nBi)
+
+    tab = np.lib.format.open_memmap(path + '.npy', mode='w+', dtype=dtype,
+                                    shape=(3, nBi, nFo, nr))
+    for b in (0, 1, 2):
+        for j, Bij in enumerate(np.exp(y)):
+            tab[b, j] = thetaGrid(r, b, z, Bij, np.exp(x))
+    tab.flush()
+
+    # measured error at the centers of every cell of every other Bi row
+    rc = np.sin(np.pi*(s[1:] + s[:-1])/4)
+    xc = (x[1:] + x[:-1])/2
+    yc = (y[1:] + y[:-1])/2
+    info = {'s': [0.0, 1.0, nr], 'logFo': [x[0], x[-1], nFo],
+            'logBi': [y[0], y[-1], nBi]}
+    err = []
+    for b in (0, 1, 2):
+        e = 0.0
+        for yj in yc[::2]:
+            exact = thetaGrid(rc, b, z, np.exp(yj), np.exp(xc))
+            rr, xx = np.meshgrid(rc, xc)
+            approx = query(dict(info, theta=tab), b, rr, np.exp(xx),
+                           np.exp(yj))
+            e = max(e, float(np.abs(approx - exact).max()))
+        err.append(e)
+    info['err'] = err
+    del tab
+
+    with open(path + '.json', 'w') as f:
+        json.dump(info, f, indent=1)
+
+def loadTable(path):
+    """
+    Returns the table as a dictionary with a read-only memory map of theta.
+    path = file name without extension used in makeTable
+    """
+    with open(path + '.json') as f:
+        tab = json.load(f)
+    tab['theta'] = np.load(path + '.npy', mmap_mode='r')
+    return tab
+
+def query(tab, b, r, Fo, Bi):
+    """
+    Returns theta at any number of points by trilinear interpolation of the
+    table, r, Fo and Bi are broadcast together.
+    tab = table from loadTable
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    r = dimensionless length term, (-)
+    Fo = Fourier number alpha*t/L^2, (-)
+    Bi = Biot number h*L/k, (-)
+    """
+    r, Fo, Bi = np.broadcast_arrays(r, Fo, Bi)
+    th = tab['theta'][b]
+
+    # fractional index along each axis, clamped to the grid
+    def index(v, axis):
+        lo, hi, n = tab[axis]
+        s = np.clip((v - lo)/(hi - lo)*(n - 1), 0, n - 1)
+        i = np.minimum(s.astype(np.intp), n - 2)
+        return i, s - i
+
+    i, fi = index(np.log(Bi), 'logBi')
+    j, fj = index(np.log(Fo), 'logFo')
+    k, fk = index(np.arcsin(np.clip(r, 0, 1))*2/np.pi, 's')
+
+    # interpolate along s, then log Fo, then log Bi
+    def lerp(ii, jj):
+        return th[ii, jj, k]*(1 - fk) + th[ii, jj, k+1]*fk
+
+    c0 = lerp(i, j)*(1 - fj) + lerp(i, j+1)*fj
+    c1 = lerp(i+1, j)*(1 - fj) + lerp(i+1, j+1)*fj
+    return c0*(1 - fi) + c1*fi
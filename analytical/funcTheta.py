@@ -13,6 +13,7 @@ References:
 import numpy as np
 import scipy.special as sp
 from funcRoots import roots
+from funcZeta import dfuncZetaSph, dfuncZetaCyl, dfuncZetaSlab
 
 # First and Second Terms of the Theta Function
 #------------------------------------------------------------------------------
@@ -45,10 +46,49 @@ def funcDn(r, root, b):
         Dn = np.cos(root * r)
     return Dn
 
+# First Term for a Non-Uniform Initial Profile
+#------------------------------------------------------------------------------
+
+def funcNn(root, b):
+    """
+    Norm of the second term, integral of Dn^2 * r^b from r = 0 to 1
+    root = root from the zeta, Bi equation
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    """
+    if b == 2:
+        Nn = (2*root - np.sin(2*root)) / (4*root**3)
+    elif b == 1:
+        Nn = (sp.j0(root)**2 + sp.j1(root)**2) / 2
+    elif b == 0:
+        Nn = (2*root + np.sin(2*root)) / (4*root)
+    return Nn
+
+def funcCnProfile(r0, th0, root, b):
+    """
+    First term in the theta function for an initial profile th0(r0), the
+    projection of the profile on the second term with weight r^b. The
+    integral uses the trapezoid rule on the points of the profile, for th0 = 1
+    it gives funcCn.
+    r0 = dimensionless length values of the profile from 0 to 1, (-)
+    th0 = initial theta at r0, extra axes after the first are kept, (-)
+    root = roots from the zeta, Bi equation
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    """
+    root = np.atleast_1d(root)
+    r0 = np.asarray(r0, dtype=float)
+    th0 = np.asarray(th0, dtype=float)
+    rr = np.maximum(r0, 1e-12)[:, np.newaxis]    # prevent divide by zero
+    f = funcDn(rr, root, b) * rr**b
+    f = f.reshape(f.shape[:1] + (1,)*(th0.ndim-1) + f.shape[1:])
+    f = f * th0[..., np.newaxis]
+    dr = np.diff(r0).reshape((-1,) + (1,)*th0.ndim)
+    In = ((f[1:] + f[:-1]) * dr).sum(axis=0) / 2
+    return In / funcNn(root, b)
+
 # Theta Function
 #------------------------------------------------------------------------------
 
-def theta(r, b, z, Bi, Fo):
+def theta(r, b, z, Bi, Fo, th0=None, r0=None):
     """
     Dimensionless temperature for analytical solution of 1D transient heat
     conduction for a solid sphere, cylinder, or slab.
@@ -57,18 +97,107 @@ def theta(r, b, z, Bi, Fo):
     z = range of zeta values to evaluate zeta, Bi equation for positive roots
     Bi = Biot number h*L/k, (-)
     Fo = Fourier number alpha*t/L^2, (-)
+    th0 = initial theta profile at r0, None for a uniform initial temp, (-)
+    r0 = dimensionless length values of th0, evenly spaced from 0 to 1 if None
     """
     
     rts = roots(z, b, Bi)   # positive roots of the zeta, Bi equation
     n = len(rts)            # number of positive roots
     
+    # first terms of all roots, from the initial profile if one is given
+    if th0 is None:
+        Cn = funcCn(rts, b)
+    else:
+        r0 = np.linspace(0, 1, len(th0)) if r0 is None else r0
+        Cn = funcCnProfile(r0, th0, rts, b)
+    
     # initial dimensionless temperature at first root
-    theta = funcCn(rts[0], b)*np.exp(-rts[0]**2 * Fo)*funcDn(r, rts[0], b)
+    theta = Cn[0]*np.exp(-rts[0]**2 * Fo)*funcDn(r, rts[0], b)
     
     # summation of theta for the remaining roots
     for i in range(1, n):
-        dTheta_o = funcCn(rts[i], b)*np.exp(-rts[i]**2 * Fo)*funcDn(r, rts[i], b)
+        dTheta_o = Cn[i]*np.exp(-rts[i]**2 * Fo)*funcDn(r, rts[i], b)
         theta = theta + dTheta_o
         
     return theta    # theta temperature profile evaluated at r
-    
\ No newline at end of file
+
+
+# Derivatives of the First and Second Terms
+#------------------------------------------------------------------------------
+
+def funcdCn(root, b):
+    """
+    Derivative of the first term with respect to the root, dCn/dzeta
+    root = root from the zeta, Bi equation
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    """
+    if b == 2:
+        num = 4*(np.sin(root)-root*np.cos(root))
+        den = 2*root-np.sin(2*root)
+        dCn = (4*root*np.sin(root)*den - num*4*np.sin(root)**2) / den**2
+    elif b == 1:
+        j0 = sp.j0(root)
+        j1 = sp.j1(root)
+        q = j0**2 + j1**2
+        dj1 = j0 - j1/root
+        dq = -2*j1**2/root
+        dCn = -(2/root**2)*(j1/q) + (2/root)*(dj1*q - j1*dq)/q**2
+    elif b == 0:
+        num = 4*np.sin(root)
+        den = 2*root + np.sin(2*root)
+        dCn = (4*np.cos(root)*den - num*4*np.cos(root)**2) / den**2
+    return dCn
+
+def funcdDn(r, root, b):
+    """
+    Derivative of the second term with respect to the root, dDn/dzeta
+    r = dimensionless length term, (-)
+    root = root from the zeta, Bi equation
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    """
+    if b == 2:
+        dDn = (np.cos(root*r) - np.sin(root*r)/(root*r)) / root
+    elif b == 1:
+        dDn = -r*sp.j1(root*r)
+    elif b == 0:
+        dDn = -r*np.sin(root*r)
+    return dDn
+
+# Parameter Derivatives of the Theta Function
+#------------------------------------------------------------------------------
+
+def dtheta(r, b, z, Bi, Fo):
+    """
+    Closed-form derivatives of theta with respect to the Biot and Fourier
+    numbers, returned as (dtheta/dBi, dtheta/dFo). The root derivative comes
+    from the zeta, Bi equation f(zeta, Bi) = 0 as dzeta/dBi = -f_Bi / f_zeta.
+    r = dimensionaless length term to evaluate theta, (-)
+    b = shape factor where 2 sphere or 1 cylinder or 0 slab, (-)
+    z = range of zeta values to evaluate zeta, Bi equation for positive roots
+    Bi = Biot number h*L/k, (-)
+    Fo = Fourier number alpha*t/L^2, (-)
+    """
+    rts = roots(z, b, Bi)   # positive roots of the zeta, Bi equation
+
+    # derivative of the roots with respect to Bi
+    if b == 2:
+        drts = 1/dfuncZetaSph(rts, Bi)
+    elif b == 1:
+        drts = sp.j0(rts)/dfuncZetaCyl(rts, Bi)
+    elif b == 0:
+        drts = 1/dfuncZetaSlab(rts, Bi)
+
+    dBi = 0
+    dFo = 0
+
+    # summation of the derivative of each term in theta
+    for rt, drt in zip(rts, drts):
+        Cn = funcCn(rt, b)
+        Dn = funcDn(r, rt, b)
+        En = np.exp(-rt**2 * Fo)
+        dEn = -2*rt*Fo*En     # derivative of exp(-root^2 Fo) wrt the root
+        dBi = dBi + (funcdCn(rt, b)*En*Dn + Cn*dEn*Dn
+                     + Cn*En*funcdDn(r, rt, b))*drt
+        dFo = dFo - rt**2 * Cn*En*Dn
+
+    return dBi, dFo
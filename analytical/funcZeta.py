@@ -6,6 +6,10 @@ sphere:   1-z*cot(z) = Bi         as f(z) = 1-z*cot(z)-Bi
 cylinder: z*(J1(z)/J0(z)) = Bi    as f(z) = z*J1(z)-Bi*J0(z)
 slab:     z*tan(z) = Bi           as f(z) = z*tan(z)-Bi
 
+The derivatives df/dz and d2f/dz2 are also provided for Newton and Halley
+iterations and for the derivative of the roots with respect to Bi where
+dz/dBi = -(df/dBi)/(df/dz).
+
 Reference:
 Bergman, Lavine, Incropera, Dewitt 2011 from Ch. 5, pg.299-304
 """
@@ -48,5 +52,69 @@ def funcZetaSlab(z, Bi):
     """
     f = z*np.tan(z) - Bi
     return f
-    
-    
\ No newline at end of file
+
+
+# Derivatives
+#------------------------------------------------------------------------------
+
+def dfuncZetaSph(z, Bi):
+    """
+    derivative of the sphere function as df/dz = z/sin(z)^2 - cot(z)
+    z = zeta values where the derivative is evaluated
+    Bi = Biot number h*L/k, (-)
+    """
+    df = z/(np.sin(z)**2) - 1/np.tan(z)
+    return df
+
+
+def dfuncZetaCyl(z, Bi):
+    """
+    derivative of the cylinder function as df/dz = z*J0(z) + Bi*J1(z)
+    z = zeta values where the derivative is evaluated
+    Bi = Biot number h*L/k, (-)
+    """
+    df = z*sp.j0(z) + Bi*sp.j1(z)
+    return df
+
+
+def dfuncZetaSlab(z, Bi):
+    """
+    derivative of the slab function as df/dz = tan(z) + z/cos(z)^2
+    z = zeta values where the derivative is evaluated
+    Bi = Biot number h*L/k, (-)
+    """
+    df = np.tan(z) + z/(np.cos(z)**2)
+    return df
+
+
+def d2funcZetaSph(z, Bi):
+    """
+    second derivative of the sphere function as
+    d2f/dz2 = 2*(sin(z) - z*cos(z))/sin(z)^3
+    z = zeta values where the derivative is evaluated
+    Bi = Biot number h*L/k, (-)
+    """
+    d2f = 2*(np.sin(z) - z*np.cos(z)) / np.sin(z)**3
+    return d2f
+
+
+def d2funcZetaCyl(z, Bi):
+    """
+    second derivative of the cylinder function as
+    d2f/dz2 = J0(z) - z*J1(z) + Bi*(J0(z) - J1(z)/z)
+    z = zeta values where the derivative is evaluated
+    Bi = Biot number h*L/k, (-)
+    """
+    d2f = sp.j0(z) - z*sp.j1(z) + Bi*(sp.j0(z) - sp.j1(z)/z)
+    return d2f
+
+
+def d2funcZetaSlab(z, Bi):
+    """
+    second derivative of the slab function as
+    d2f/dz2 = 2*(1 + z*tan(z))/cos(z)^2
+    z = zeta values where the derivative is evaluated
+    Bi = Biot number h*L/k, (-)
+    """
+    d2f = 2*(1 + z*np.tan(z)) / np.cos(z)**2
+    return d2f
@@ -0,0 +1,142 @@
+"""
+Lumped capacitance model for any number of particles with convection and
+radiation at the surface and gas conditions that change with time along each
+particle trajectory. The energy balance for each particle is
+
+    rho*cp*V*dT/dt = A*h(t)*(Tinf(t) - T) + A*eps*sigma*(Tw(t)^4 - T^4)
+
+with A/V = (b+1)/ro, i.e. 6/d for a sphere. Each time step is solved with the
+theta method, theta = 1 backward Euler and theta = 0.5 trapezoid (default,
+second order). The implicit equation of every particle is solved by Newton
+iterations on all particles at once, which converge in a few iterations since
+the right side decreases with T. Without radiation and with constant h and
+Tinf it reduces to T = Tinf + (Ti - Tinf)*exp(-t/tau) of lump_sphere.py.
+
+Requirements:
+Python 3, NumPy
+
+Reference:
+Bergman, Lavine, Incropera, Dewitt 2011, Ch. 5, pg. 280-286 and Ch. 1, pg. 9-10
+"""
+
+# Modules
+# -----------------------------------------------------------------------------
+
+import numpy as np
+
+sigma = 5.670374419e-8  # Stefan-Boltzmann constant, W/m^2*K^4
+
+# Time Step
+# -----------------------------------------------------------------------------
+
+def rate(T, a, h, Tinf, Tw, es):
+    """
+    Returns dT/dt and its derivative with respect to T.
+    T = particle temperature, K
+    a = A/(rho*cp*V), m^2*K/J
+    h = heat transfer coefficient, W/m^2*K
+    Tinf = gas temperature, K
+    Tw = radiation temperature of the surroundings, K
+    es = emissivity times sigma, W/m^2*K^4
+    """
+    T3 = T*T*T
+    f = a*(h*(Tinf - T) + es*(Tw*Tw*Tw*Tw - T3*T))
+    df = -a*(h + 4*es*T3)
+    return f, df
+
+def step(T, dt, a, old, new, es, theta=0.5, tol=1e-10, maxit=20):
+    """
+    Returns the temperatures after one time step of the theta method.
+    T = temperatures at the start of the step, K
+    dt = time step, s
+    a = A/(rho*cp*V), m^2*K/J
+    old = (h, Tinf, Tw) at the start of the step
+    new = (h, Tinf, Tw) at the end of the step
+    es = emissivity times sigma, W/m^2*K^4
+    theta = 1 backward Euler, 0.5 trapezoid
+    tol = relative tolerance of the Newton iterations
+    maxit = max number of Newton iterations
+    """
+    f0, df0 = rate(T, a, *old, es)
+    rhs = T + (1 - theta)*dt*f0
+
+    # step of the equation linearized at T as the first guess
+    Tn = T + dt*f0/(1 - theta*dt*df0)
+    for it in range(maxit):
+        f, df = rate(Tn, a, *new, es)
+        dT = (Tn - theta*dt*f - rhs)/(1 - theta*dt*df)
+        Tn = Tn - dT
+        if np.all(np.abs(dT) <= tol*np.abs(Tn)):
+            break
+    return Tn
+
+# Solver
+# -----------------------------------------------------------------------------
+
+def value(x, t, i):
+    """
+    Returns a time-varying parameter at time row i. A 1-D array is always a
+    time history, so a constant for each particle is given as a row with
+    shape (1, n), as for the ambient temp of the implicit solver.
+    x = constant, time history with shape (len(t),) or (len(t), n), one value
+        per particle with shape (1, n) or function of time
+    t = times, s
+    i = time row
+    """
+    if callable(x):
+        return x(t[i])
+    x = np.asarray(x)
+    if x.ndim == 0:
+        return x
+    if len(x) == len(t):
+        return x[i]
+    if len(x) == 1:
+        return x[0]
+    raise ValueError('h, Tinf and Tw need len(t) = %d rows (time history) or '
+                     'shape (1, n) for one value per particle, got shape %s'
+                     % (len(t), x.shape))
+
+def solve(b, rho, cp, d, Ti, t, h, Tinf, Tw=None, eps=0, theta=0.5,
+          store=True):
+    """
+    Returns the temperatures with shape (len(t), n) for n particles, or only
+    the temperatures at the last time if store is False.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    rho = density, kg/m^3
+    cp = specific heat capacity, J/kg*K
+    d = particle diameter or slab thickness, m
+    Ti = initial particle temp, K
+    t = times starting at the initial time, s
+    h = heat transfer coefficient, W/m^2*K
+    Tinf = gas temperature, K
+    Tw = radiation temperature of the surroundings, K, same as Tinf if None
+    eps = emissivity of the particle surface, (-)
+    theta = 1 backward Euler, 0.5 trapezoid
+    store = False to keep only the last temperatures for many particles
+
+    h, Tinf and Tw are each a constant, an array with one row per time (and
+    one column per particle), a row with shape (1, n) of constant values per
+    particle or a function f(t) that returns the values for all particles at
+    time t. rho, cp, d, Ti and eps may be arrays of n
+    particles.
+    """
+    t = np.asarray(t, dtype=float)
+    Tw = Tinf if Tw is None else Tw
+    a = (b+1)/(np.asarray(d)/2)/(np.asarray(rho)*np.asarray(cp))
+    es = np.asarray(eps)*sigma
+
+    old = tuple(value(x, t, 0) for x in (h, Tinf, Tw))
+    T = np.broadcast_to(np.asarray(Ti, dtype=float),
+                        np.broadcast(a, es, Ti, *old).shape).copy()
+    if store:
+        TT = np.zeros((len(t),) + T.shape)
+        TT[0] = T
+
+    for i in range(1, len(t)):
+        new = tuple(value(x, t, i) for x in (h, Tinf, Tw))
+        T = step(T, t[i] - t[i-1], a, old, new, es, theta)
+        old = new
+        if store:
+            TT[i] = T
+
+    return TT if store else T
@@ -0,0 +1,116 @@
+"""
+Implicit numerical solution of 2D axisymmetric (r, z) transient heat
+conduction in a solid finite cylinder with convection at the side and end
+surfaces, symmetry at the axis and at the center plane z = 0, and no heat of
+reaction. Uses alternating direction implicit (ADI) splitting so each half
+step is a batch of tridiagonal solves along r and then along z. Two schemes
+are available:
+
+'lod' - one implicit (backward Euler) step along each direction in turn
+
+    [Ar]{T*}   = {T} + gr*Tinf
+    [Az]{T+1}  = {T*} + gz*Tinf
+
+'pr' - Peaceman-Rachford, implicit along one direction and explicit along the
+other for each half step
+
+    [Ar]{T*}   = 2{T}  - [Az]{T}  + gz*Tinf + gr*Tinf
+    [Az]{T+1}  = 2{T*} - [Ar]{T*} + gr*Tinf + gz*Tinf
+
+where [Ar] and [Az] are the 1D matrices of num_cylinder.py (b = 1) and of a
+slab (b = 0), gr and gz are their surface coefficients applied at the side and
+end surface nodes. The 'lod' scheme is first order in time like the 1D
+solvers, reduces to them for a long cylinder and does not oscillate. The 'pr'
+scheme is second order in time for smooth solutions but large time steps give
+decaying oscillations at the edge after the step change in Tinf at t = 0.
+Each matrix is factored once per run and solved for all lines at once, so a
+step costs O(nr*nz).
+
+Functions:
+implicit.py returns the ambient temp for each time step
+tridiag.py returns the diagonals of [A] and the tridiagonal LU functions
+adi <- implicit, tridiag
+
+References:
+1) Ozisik 1993, Ch.12, pg.459
+2) Peaceman, Rachford 1955, The numerical solution of parabolic and elliptic
+   differential equations
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import numpy as np
+from implicit import ambient
+from tridiag import coeffs, factor, backsolve, matvec
+
+# ADI Solver
+# -----------------------------------------------------------------------------
+
+def solve(rho, cp, k, h, d, H, Ti, Tinf, tmax, nt, nr, nz, scheme='lod'):
+    """
+    Returns the temperature array TT with shape (nt+1, nr+1, nz+1) where
+    TT[:, 0, 0] is the center, TT[:, nr, 0] the middle of the side surface,
+    TT[:, 0, nz] the middle of the end surface and TT[:, nr, nz] the edge.
+    rho = density of wood, kg/m^3
+    cp = specific heat capacity, J/kg*K
+    k = thermal conductivity, W/m*K
+    h = heat transfer coefficient, W/m^2*K
+    d = cylinder diameter, m
+    H = cylinder height, m
+    Ti = initial particle temp, K
+    Tinf = ambient temp as a constant or one value per time row, K
+    tmax = max time, s
+    nt = number of time steps
+    nr = number of radius steps from the axis to the side surface
+    nz = number of height steps from the center plane to the end surface
+    scheme = 'lod' or 'pr' (Peaceman-Rachford), see above
+    """
+    mr = nr+1
+    mz = nz+1
+    dt = tmax/nt
+    dr = (d/2)/nr
+    dz = (H/2)/nz
+    alpha = k/(rho*cp)
+
+    if scheme == 'lod':
+        dts = dt        # each direction is a full implicit step
+    elif scheme == 'pr':
+        dts = dt/2      # each direction is half implicit and half explicit
+    else:
+        raise ValueError("scheme must be 'lod' or 'pr'")
+
+    # 1D matrices along r (cylinder) and z (slab)
+    Ar = coeffs(1, alpha*dts/dr**2, h*dr/k, mr)
+    Az = coeffs(0, alpha*dts/dz**2, h*dz/k, mz)
+    gr = Ar[3]
+    gz = Az[3]
+    lur = factor(*Ar[:3])
+    luz = factor(*Az[:3])
+    Tinf = ambient(Tinf, nt, ())
+
+    TT = np.zeros((nt+1, mr, mz))
+    TT[0] = Ti
+
+    for i in range(1, nt+1):
+        T = TT[i-1]
+
+        # implicit along r for every z line
+        if scheme == 'lod':
+            C = T.copy()
+        else:
+            C = 2*T - matvec(*Az[:3], T.T).T
+            C[:, mz-1] += gz*Tinf[i]
+        C[mr-1, :] += gr*Tinf[i]
+        Ts = backsolve(lur, C)
+
+        # implicit along z for every r line
+        if scheme == 'lod':
+            C = Ts.T.copy()
+        else:
+            C = (2*Ts - matvec(*Ar[:3], Ts)).T
+            C[:, mr-1] += gr*Tinf[i]
+        C[mz-1, :] += gz*Tinf[i]
+        TT[i] = backsolve(luz, C).T
+
+    return TT
@@ -0,0 +1,241 @@
+"""
+On-disk cache of simulation results keyed on a hash of the model function,
+its arguments and the code. The key is the SHA-256 of a canonical JSON form of
+
+    module and name of the function
+    all arguments bound to the signature with the defaults filled in
+    hash of the .py files of the source folders (the code version)
+
+where integers are taken as floats and arrays are hashed from their dtype,
+shape and bytes, so a call with the same values by position or by keyword
+gives the same key and any change to the code, also in the analytical folder
+used by the numerical solvers, gives a new key. Functions are keyed by module
+and name, so only top-level functions that can be imported are accepted and
+lambdas, closures, local functions and partials raise TypeError, as do other
+objects without a canonical form. Frozen scipy.stats distributions are keyed
+by name and arguments. A result, an array or nested tuples and
+dictionaries of arrays, is saved as one compressed .npz file named by the
+key, so a repeated case costs one file read. Results that are not arrays of
+numbers or strings raise TypeError instead of being pickled.
+
+Files are written to a temporary name and renamed, which is atomic, so
+several processes can use the same cache folder. A hit updates the file time
+and when the folder is larger than the size limit the least recently used
+files are removed first.
+
+Functions:
+cache <- any solver function, e.g. implicit.solve or probes.record
+"""
+
+# Modules
+# -----------------------------------------------------------------------------
+
+import glob
+import hashlib
+import inspect
+import json
+import os
+import sys
+import numpy as np
+
+# Canonical Key
+# -----------------------------------------------------------------------------
+
+def canon(x):
+    """
+    Returns a JSON serializable form of x where equal values give equal forms.
+    x = number, string, array, top-level function, frozen distribution or a
+        list, tuple or dictionary of them
+    """
+    if isinstance(x, dict):
+        return {str(k): canon(v) for k, v in x.items()}
+    if isinstance(x, (list, tuple)):
+        return [canon(v) for v in x]
+    if isinstance(x, np.ndarray):
+        if x.dtype.kind in 'iu':
+            x = x.astype(float)     # same key as the float values
+        x = np.ascontiguousarray(x)
+        return ['ndarray', x.dtype.str, x.shape,
+                hashlib.sha256(x.tobytes()).hexdigest()]
+    if isinstance(x, np.generic):
+        return canon(x.item())
+    if isinstance(x, type):
+        return np.dtype(x).str if issubclass(x, np.generic) else x.__name__
+    if isinstance(x, bool) or x is None or isinstance(x, (float, str)):
+        return x
+    if isinstance(x, int):
+        return float(x)
+    if hasattr(x, 'dist') and hasattr(x, 'args') and hasattr(x, 'kwds'):
+        return ['dist', x.dist.name, canon(x.args), canon(x.kwds)]
+    if callable(x):
+        return qualified(x)
+    raise TypeError('cannot make a cache key of type %s' % type(x).__name__)
+
+def qualified(fun):
+    """
+    Returns the module and name of a top-level function, raises TypeError for
+    lambdas, closures, local functions, partials and other callables that
+    cannot be found again by their name.
+    fun = function
+    """
+    mod = getattr(fun, '__module__', None)
+    qual = getattr(fun, '__qualname__', None)
+    obj = sys.modules.get(mod)
+    for part in (qual or '<').split('.'):
+        obj = getattr(obj, part, None)
+    if obj is not fun:
+        raise TypeError('cannot cache %r, only top-level functions that can '
+                        'be imported by name are keyed' % (fun,))
+    return [mod, qual]
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+versions = {}   # hash of the code of each set of folders, once per process
+
+def version(fun):
+    """
+    Returns the hash of the .py files in the source folders of this
+    repository (analytical, lumped and numerical) and in the folder of the
+    function, so a change in any module the function may import gives a new
+    key.
+    fun = function to run
+    """
+    folder = os.path.dirname(os.path.abspath(inspect.getfile(fun)))
+    if folder not in versions:
+        files = set(glob.glob(os.path.join(root, '*', '*.py')))
+        files.update(glob.glob(os.path.join(folder, '*.py')))
+        h = hashlib.sha256()
+        for f in sorted(os.path.relpath(f, root) for f in files):
+            with open(os.path.join(root, f), 'rb') as src:
+                h.update(f.encode() + src.read())
+        versions[folder] = h.hexdigest()
+    return versions[folder]
+
+def key(fun, *args, **kw):
+    """
+    Returns the hex key of a call of fun with the arguments.
+    fun = function to run
+    args, kw = arguments of fun
+    """
+    bound = inspect.signature(fun).bind(*args, **kw)
+    bound.apply_defaults()
+    s = json.dumps([qualified(fun), version(fun),
+                    canon(dict(bound.arguments))], sort_keys=True)
+    return hashlib.sha256(s.encode()).hexdigest()
+
+# Save and Load Results
+# -----------------------------------------------------------------------------
+
+def flatten(res, arrays):
+    """
+    Returns the layout of a result and adds its arrays to the dictionary
+    arrays under the names a0, a1, ... The layout is ['a', name] for an
+    array, ['t', [layouts]] for a tuple and ['d', {key: layout}] for a
+    dictionary, so nested tuples and dictionaries are kept.
+    res = array, or tuple or dictionary of results
+    arrays = dictionary of name and array to save
+    """
+    if isinstance(res, dict):
+        if not all(isinstance(k, str) for k in res):
+            raise TypeError('cached dictionaries need string keys')
+        return ['d', {k: flatten(v, arrays) for k, v in res.items()}]
+    if isinstance(res, tuple):
+        return ['t', [flatten(v, arrays) for v in res]]
+    a = np.asarray(res)
+    if a.dtype == object:
+        raise TypeError('cannot cache a result of type %s'
+                        % type(res).__name__)
+    name = 'a%d' % len(arrays)
+    arrays[name] = a
+    return ['a', name]
+
+def unflatten(layout, f):
+    """
+    Returns the result of a layout from flatten with the arrays of f.
+    layout = layout from flatten
+    f = saved arrays by name
+    """
+    kind, x = layout
+    if kind == 'd':
+        return {k: unflatten(v, f) for k, v in x.items()}
+    if kind == 't':
+        return tuple(unflatten(v, f) for v in x)
+    return f[x]
+
+def save(path, res):
+    """
+    Writes a result to path as a compressed .npz file, the layout of nested
+    tuples and dictionaries is saved as a JSON string next to the arrays.
+    path = file name
+    res = array, or tuple or dictionary of arrays, tuples and dictionaries
+    """
+    arrays = {}
+    layout = flatten(res, arrays)
+    arrays['layout'] = np.array(json.dumps(layout))
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp, path)
+
+def load(path):
+    """
+    Returns the result saved in path.
+    path = file name
+    """
+    with np.load(path) as f:
+        return unflatten(json.loads(str(f['layout'])), f)
+
+# Cache
+# -----------------------------------------------------------------------------
+
+class Cache:
+    """
+    Cache of results in a folder limited to a total size in bytes.
+    path = cache folder, created if needed
+    limit = max total size of the cached files, bytes
+    """
+
+    def __init__(self, path, limit=2**30):
+        self.path = path
+        self.limit = limit
+        os.makedirs(path, exist_ok=True)
+
+    def run(self, fun, *args, **kw):
+        """
+        Returns fun(*args, **kw) from the cache, or runs it and caches the
+        result.
+        fun = function to run
+        args, kw = arguments of fun
+        """
+        f = os.path.join(self.path, key(fun, *args, **kw) + '.npz')
+        try:
+            res = load(f)
+            os.utime(f)     # mark as recently used
+            return res
+        except (OSError, ValueError):
+            pass
+        res = fun(*args, **kw)
+        save(f, res)
+        self.evict()
+        return res
+
+    def evict(self):
+        """
+        Removes the least recently used files until the folder is within the
+        size limit, files removed by another process are skipped.
+        """
+        files = []
+        for f in glob.glob(os.path.join(self.path, '*.npz')):
+            try:
+                s = os.stat(f)
+            except FileNotFoundError:
+                continue
+            files.append((s.st_mtime, s.st_size, f))
+        total = sum(s for t, s, f in files)
+        for t, s, f in sorted(files):
+            if total <= self.limit:
+                break
+            try:
+                os.remove(f)
+            except FileNotFoundError:
+                pass
+            total -= s
@@ -0,0 +1,120 @@
+"""
+Ensemble of implicit numerical solutions of 1D transient heat conduction in
+solid spheres or cylinders solved by several worker processes. The result
+block with shape (nt+1, number of stored nodes, n) is allocated once in
+shared memory from the nr and nt settings, every worker steps a chunk of
+particles as one batch with implicit.march and writes the stored nodes of
+each step directly into the block, and the parent gets a NumPy view of the
+block. Only the chunk limits are sent between processes, so no result arrays
+are pickled.
+
+The shared memory name is unlinked when the run ends, the memory stays mapped
+until the returned SharedMemory object is closed, so keep it while the view
+is used and call shm.close() afterwards.
+
+Functions:
+implicit.py returns the grid Fourier and Biot numbers and the solver loop
+probes.py returns the node index of each probe radius
+ensemble <- implicit, probes
+
+Reference:
+Ozisik 1993, Ch.12, pg.459
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from implicit import params, march
+from probes import nodes
+
+# Worker
+# -----------------------------------------------------------------------------
+
+def work(name, shape, dtype, i0, i1, b, p, Ti, Tinf, tmax, nt, nr, idx):
+    """
+    Solves particles i0 to i1 and writes them into the shared result block.
+    name = name of the shared memory block
+    shape = shape of the result block (nt+1, len(idx), n)
+    dtype = float type of the result block
+    i0, i1 = first and last+1 particle of the chunk
+    b = shape factor where 2 sphere, 1 cylinder
+    p = tuple of rho, cp, k, h, d arrays for the particles of the chunk
+    Ti = initial particle temp, K
+    Tinf = ambient temp as a constant, one value per time row or an array
+           with shape (nt+1, i1-i0) or (1, i1-i0), K
+    tmax = max time, s
+    nt = number of time steps
+    nr = number of radius steps
+    idx = node indices to store
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        TT = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        Fo, Bi, dt = params(*p, tmax, nt, nr)
+        TT[0, :, i0:i1] = Ti
+        # each step goes straight into the block, only the stored nodes
+        for i, T in enumerate(march(b, Fo, Bi, Ti, Tinf, nr+1, nt), 1):
+            TT[i, :, i0:i1] = T[idx]
+        del TT
+    finally:
+        shm.close()
+    return i1 - i0
+
+# Ensemble Run
+# -----------------------------------------------------------------------------
+
+def run(b, rho, cp, k, h, d, Ti, Tinf, tmax, nt, nr, r=None, workers=None,
+        chunk=None, dtype=np.float64):
+    """
+    Returns the temperature array TT with shape (nt+1, number of stored nodes,
+    n) as a view of shared memory and the SharedMemory object that holds it.
+    b = shape factor where 2 sphere, 1 cylinder
+    rho, cp, k, h, d = density kg/m^3, specific heat J/kg*K, conductivity
+                       W/m*K, heat transfer coefficient W/m^2*K and diameter
+                       m, each a constant or an array of n particles
+    Ti = initial particle temp, K
+    Tinf = ambient temp as a constant, one value per time row, an array
+           with shape (nt+1, n) or one value per particle with shape (1, n), K
+    tmax = max time, s
+    nt = number of time steps
+    nr = number of radius steps
+    r = dimensionless radii r/ro of the nodes to store, None for all nodes
+    workers = number of worker processes, default number of CPUs
+    chunk = number of particles for each task, default n/workers since the
+            cost of a batch is mostly the loop over the time steps
+    dtype = float type of the result block, float64 or float32
+    """
+    p = np.broadcast_arrays(*[np.atleast_1d(np.asarray(x, dtype=float))
+                              for x in (rho, cp, k, h, d)])
+    n = len(p[0])
+    Tinf = np.asarray(Tinf, dtype=float)
+    idx = np.arange(nr+1) if r is None else nodes(np.atleast_1d(r), nr)
+    workers = workers or os.cpu_count()
+    chunk = chunk or max(1, -(-n//workers))
+
+    shape = (nt+1, len(idx), n)
+    size = int(np.prod(shape))*np.dtype(dtype).itemsize
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            tasks = []
+            for i0 in range(0, n, chunk):
+                i1 = min(i0+chunk, n)
+                Tc = Tinf[:, i0:i1] if Tinf.ndim == 2 else Tinf
+                tasks.append(pool.submit(work, shm.name, shape, dtype, i0, i1,
+                                         b, [x[i0:i1] for x in p], Ti, Tc,
+                                         tmax, nt, nr, idx))
+            for task in tasks:
+                task.result()
+    except BaseException:
+        shm.close()
+        raise
+    finally:
+        shm.unlink()
+
+    TT = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return TT, shm
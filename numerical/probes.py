@@ -0,0 +1,144 @@
+"""
+Recording probes for the implicit numerical solution of 1D transient heat
+conduction in a solid sphere or cylinder. Instead of the full field TT with
+shape (nt+1, m) the solver keeps only the temperature at a few nodes at the
+output times, and reducers that are updated at every step:
+
+    avg = volume average temperature, sum(w*T) with the weights of volWeights
+    flux = surface heat flux into the particle, q = h*(Tinf - Ts)
+    energy = heat absorbed per unit volume, E = sum(q*dt) * (b+1)/ro
+
+The flux is taken at the end of each step as in the implicit scheme, so the
+absorbed heat from the surface flux agrees with rho*cp*(avg - Ti) to the
+discretization error of the grid, about 1% for the sphere with nr = 99. A run
+stores kilobytes for any nt, e.g. center and surface at 100 output times.
+
+Long runs can write a checkpoint every few steps to a .npz file with the node
+temperatures, the time step, the accumulated probe data and a key of all
+inputs (b, m, nt, hashes of rho, cp, k, h, d, Ti, Tinf and tmax, the float
+type, the probe nodes and a hash of the output steps), so also the flux and
+energy reducers that depend on h and d separately belong to the same run. A
+run given the same checkpoint file resumes from it when the key matches and
+gives the same results bit for bit as a run that was not interrupted, since
+[A] is factored again from the same Fo and Bi and the steps repeat the same
+operations. The checkpoint is removed when the run is complete.
+
+Functions:
+implicit.py returns the grid parameters, volume weights, the solver loop and
+the checkpoint functions
+probes <- implicit
+
+Reference:
+Ozisik 1993, Ch.12, pg.459
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import numpy as np
+from implicit import (params, volWeights, ambient, march, digest, save,
+                      resume, finish)
+
+# Probe Locations and Output Times
+# -----------------------------------------------------------------------------
+
+def nodes(r, nr):
+    """
+    Returns the node index nearest to each dimensionless radius r/ro.
+    r = dimensionless radii from 0 (center) to 1 (surface), (-)
+    nr = number of radius steps
+    """
+    return np.rint(np.clip(r, 0, 1)*nr).astype(int)
+
+def steps(times, tmax, nt):
+    """
+    Returns the sorted unique time step index nearest to each output time.
+    times = output times, s
+    tmax = max time, s
+    nt = number of time steps
+    """
+    return np.unique(np.rint(np.clip(times, 0, tmax)/tmax*nt).astype(int))
+
+# Solver with Probes and Reducers
+# -----------------------------------------------------------------------------
+
+def record(b, rho, cp, k, h, d, Ti, Tinf, tmax, nt, nr, r=(0, 1), times=None,
+           acc=np.float64, checkpoint=None, every=1000):
+    """
+    Returns a dictionary with the output times 't', the node indices 'nodes'
+    and the arrays 'T' with shape (len(t), len(nodes)), 'avg', 'flux' and
+    'energy' with shape (len(t),). Parameters may be arrays of n particles in
+    which case every array has a last axis for the particles.
+    b = shape factor where 2 sphere, 1 cylinder
+    rho = density of wood, kg/m^3
+    cp = specific heat capacity, J/kg*K
+    k = thermal conductivity, W/m*K
+    h = heat transfer coefficient, W/m^2*K
+    d = particle diameter, m
+    Ti = initial particle temp, K
+    Tinf = ambient temp as a constant or one value per time row, K
+    tmax = max time, s
+    nt = number of time steps
+    nr = number of radius steps
+    r = dimensionless radii r/ro of the probes, default center and surface
+    times = output times in s, default every time step
+    acc = float type of the solver, float64 or float32
+    checkpoint = path of the .npz checkpoint file to write and to resume from,
+                 None for no checkpoints
+    every = number of time steps between checkpoints
+    """
+    m = nr+1
+    Fo, Bi, dt = params(rho, cp, k, h, d, tmax, nt, nr)
+    shape = np.broadcast(Fo, Bi).shape
+    idx = nodes(np.atleast_1d(r), nr)
+    out = np.arange(nt+1) if times is None else steps(times, tmax, nt)
+    w = volWeights(b, m).reshape((m,) + (1,)*len(shape))
+    # all inputs of the run, must match to resume, arrays only as hashes
+    key = {'b': b, 'm': m, 'nt': nt, 'rho': digest(rho), 'cp': digest(cp),
+           'k': digest(k), 'h': digest(h), 'd': digest(d), 'Ti': digest(Ti),
+           'Tinf': digest(Tinf), 'tmax': digest(tmax),
+           'acc': np.dtype(acc).str, 'nodes': idx, 'out': digest(out)}
+    Tinf = ambient(Tinf, nt, shape)
+    h = np.asarray(h)
+    area = (b+1)/(d/2)      # surface area per unit volume, 1/m
+
+    res = {'t': out*dt, 'nodes': idx,
+           'T': np.zeros((len(out), len(idx)) + shape),
+           'avg': np.zeros((len(out),) + shape),
+           'flux': np.zeros((len(out),) + shape),
+           'energy': np.zeros((len(out),) + shape)}
+
+    # reducers at t = 0 for a uniform initial temperature
+    T = np.full((m,) + shape, Ti, dtype=acc)
+    q = h*(Tinf[0] - Ti)
+    E = np.zeros(shape)
+    start = 1
+    j = 0
+    if out[0] == 0:
+        res['T'][0] = T[idx]
+        res['avg'][0] = Ti
+        res['flux'][0] = q
+        j = 1
+
+    state = resume(checkpoint, key)
+    if state is not None:
+        T, E = state['T'], state['E']
+        start, j = int(state['start']), int(state['j'])
+        res = {n: state['res_' + n] for n in res}
+
+    for i, T in enumerate(march(b, Fo, Bi, T, Tinf, m, nt, acc, start), start):
+        q = h*(Tinf[i] - T[m-1])
+        E = E + q*dt*area
+        if j < len(out) and out[j] == i:
+            res['T'][j] = T[idx]
+            res['avg'][j] = (w*T).sum(axis=0)
+            res['flux'][j] = q
+            res['energy'][j] = E
+            j += 1
+        if checkpoint is not None and i % every == 0 and i < nt:
+            state = {'T': T, 'E': E, 'start': i+1, 'j': j}
+            state.update({'res_' + n: v for n, v in res.items()})
+            save(checkpoint, key, state)
+
+    finish(checkpoint)
+    return res
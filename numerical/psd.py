@@ -0,0 +1,116 @@
+"""
+Heating curves for a particle size distribution (PSD) by reuse of the
+nondimensional solution. Every particle size maps onto the dimensionless
+problem theta(r/ro, Fo, Bi) with Bi = h*ro/k and Fo = alpha*t/ro^2, so sizes
+are grouped by Bi and each distinct Bi is solved once on a dimensionless grid
+that ends at the largest Fo of its group, so large particles are not solved
+with the few steps of the Fo range of the smallest particle. Each size bin is
+then rescaled to physical time by interpolation in Fo.
+
+Functions:
+implicit.py returns the implicit solver and volume average weights
+psd <- implicit <- tridiag
+
+References:
+1) Ozisik 1993, Ch.12, pg.459
+2) Papadikis 2010a
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import numpy as np
+from implicit import solve, volWeights
+
+# Group Sizes by Biot Number
+# -----------------------------------------------------------------------------
+
+def groupBi(Bi, rtol=1e-3):
+    """
+    Returns the distinct Biot numbers and the group index of each size bin.
+    Bins whose Bi agree within about rtol share one group at their mean Bi.
+    Bi = Biot number h*ro/k of each size bin, (-)
+    rtol = relative tolerance for Bi values to share a group
+    """
+    key = np.round(np.log(Bi)/rtol).astype(int)
+    _, grp = np.unique(key, return_inverse=True)
+    grp = grp.ravel()
+    Big = np.bincount(grp, weights=Bi) / np.bincount(grp)
+    return Big, grp
+
+# PSD Heating Curves
+# -----------------------------------------------------------------------------
+
+def heating(d, w, h, b=2, rho=700, cp=1500, k=0.105, Ti=300, Tinf=773,
+            tmax=0.8, nt=1000, nr=99, nFo=2000, basis='mass', rtol=1e-3):
+    """
+    Returns a dictionary with time t, the number of distinct Bi solved, the
+    center, surface and volume average temperatures of each size bin with
+    shape (nbins, nt+1), and their mass-weighted averages over the PSD.
+    d = particle diameter of each size bin, m
+    w = amount in each size bin as mass or number fractions, see basis
+    h = heat transfer coefficient as a scalar, an array for each bin or a
+        function h(d), W/m^2*K
+    b = shape factor where 2 sphere, 1 cylinder
+    nt = number of output time steps
+    nr = number of radius steps of the dimensionless grid
+    nFo = number of Fo steps of the dimensionless grid of each Bi group, the
+          largest size of a group gets about nFo*(dmin/dmax)^2 steps of the
+          group, which only matters when rtol groups different sizes
+    basis = 'mass' if w is a mass fraction or 'number' for a number fraction
+    rtol = relative tolerance for sizes to share a Bi group
+    """
+    d = np.asarray(d, dtype=float)
+    w = np.asarray(w, dtype=float)
+    h = h(d) if callable(h) else np.broadcast_to(np.asarray(h, dtype=float),
+                                                 d.shape)
+
+    # mass fraction of each bin where mass ~ number * d^(b+1) at equal density
+    if basis == 'number':
+        w = w*d**(b+1)
+    w = w / w.sum()
+
+    ro = d/2                    # outer radius of each size bin, m
+    alpha = k/(rho*cp)          # thermal diffusivity, m^2/s
+    Bi = h*ro/k                 # Biot number of each size bin, (-)
+    Big, grp = groupBi(Bi, rtol)
+
+    # dimensionless grid of each Bi group with Fo up to the value of the
+    # smallest particle of the group, so every group gets nFo steps
+    m = nr+1
+    rmin = np.full(len(Big), np.inf)
+    np.minimum.at(rmin, grp, ro)
+    Fomax = alpha*tmax/rmin**2
+    drn = 1/nr                              # dimensionless radius step
+    BiG = Big*drn                           # grid Biot number, (-)
+
+    # theta = (T - Tinf)/(Ti - Tinf) solved once for each distinct Bi
+    wv = volWeights(b, m)
+    Fon = np.zeros((nFo+1, len(Big)))
+    thc = np.zeros((nFo+1, len(Big)))
+    ths = np.zeros((nFo+1, len(Big)))
+    thv = np.zeros((nFo+1, len(Big)))
+    for g, Bg in enumerate(BiG):
+        Fon[:, g] = np.linspace(0, Fomax[g], nFo+1)
+        FoG = (Fomax[g]/nFo)/drn**2         # grid Fourier number, (-)
+        th = solve(b, FoG, Bg, 1, 0, m, nFo)
+        thc[:, g] = th[:, 0]
+        ths[:, g] = th[:, m-1]
+        thv[:, g] = th @ wv
+
+    # rescale each size bin to physical time
+    t = np.linspace(0, tmax, nt+1)
+    nb = len(d)
+    Tc = np.zeros((nb, nt+1))
+    Ts = np.zeros((nb, nt+1))
+    Tv = np.zeros((nb, nt+1))
+    for j in range(nb):
+        Fo = alpha*t/ro[j]**2
+        g = grp[j]
+        Tc[j] = Tinf + np.interp(Fo, Fon[:, g], thc[:, g])*(Ti-Tinf)
+        Ts[j] = Tinf + np.interp(Fo, Fon[:, g], ths[:, g])*(Ti-Tinf)
+        Tv[j] = Tinf + np.interp(Fo, Fon[:, g], thv[:, g])*(Ti-Tinf)
+
+    return {'t': t, 'nBi': len(Big), 'w': w, 'Bi': Bi,
+            'Tc': Tc, 'Ts': Ts, 'Tv': Tv,
+            'center': w @ Tc, 'surface': w @ Ts, 'avg': w @ Tv}
@@ -0,0 +1,151 @@
+"""
+Implicit numerical solution of 1D transient heat conduction in a solid sphere
+or cylinder with convection at the surface and heat of reaction from biomass
+pyrolysis kinetics at every node. The reaction scheme is
+
+    wood -> gas (k1), wood -> tar (k2), wood -> char (k3)
+    tar -> gas (k4), tar -> char (k5)
+
+with Arrhenius rates k = A*exp(-E/(R*T)) and heats of reaction for the
+primary (wood) and secondary (tar) reactions, positive for endothermic.
+
+Conduction and reaction are coupled by Strang splitting: a half step of
+kinetics, a full implicit conduction step with [A] factored once per run, and
+another half step of kinetics. The kinetics step is solved in closed form for
+the species at the temperature from the start of the half step and is
+vectorized over all nodes and particles. Properties (rho, cp, k) are
+constant as in the conduction model.
+
+Functions:
+implicit.py returns the grid Fourier and Biot numbers and the ambient temp
+tridiag.py returns the diagonals of [A] and the tridiagonal LU functions
+pyrolysis <- implicit, tridiag
+
+References:
+1) Ozisik 1993, Ch.12, pg.459
+2) Chan, Kelbon, Krieger 1985, Modelling and experimental verification of
+   physical and chemical processes during pyrolysis of a large biomass particle
+3) Di Blasi 1993, Analysis of convection and secondary reaction effects within
+   porous solid fuels undergoing pyrolysis
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import numpy as np
+from implicit import params, ambient
+from tridiag import coeffs, factor, backsolve
+
+R = 8.314   # universal gas constant, J/mol*K
+
+# species in the order of the first axis of the concentration array Y
+species = ('wood', 'gas', 'tar', 'char')
+
+# pre-exponential factor A (1/s), activation energy E (J/mol) for k1 to k5 and
+# heat of reaction (J/kg) for primary and secondary reactions
+kinetics = {'A': (1.3e8, 2.0e8, 1.08e7, 4.28e6, 1.0e5),
+            'E': (140e3, 133e3, 121e3, 108e3, 108e3),
+            'dH1': 255e3,
+            'dH2': -20e3}
+
+# Kinetics
+# -----------------------------------------------------------------------------
+
+def rates(T, kin):
+    """
+    Returns the Arrhenius rate constants k1 to k5 along the first axis, 1/s.
+    T = temperature, K
+    kin = dictionary of kinetic parameters, see kinetics
+    """
+    shape = (-1,) + (1,)*np.ndim(T)
+    A = np.reshape(kin['A'], shape)
+    E = np.reshape(kin['E'], shape)
+    return A*np.exp(-E/(R*T))
+
+def react(T, Y, dt, rho, cp, kin):
+    """
+    Returns the temperature and concentrations after a kinetics step of dt.
+    The species are solved in closed form with the rates at the temperature
+    at the start of the step, then the heat of reaction changes T.
+    T = temperature at each node and particle, K
+    Y = concentrations of wood, gas, tar, char along the first axis, kg/m^3
+    dt = time step, s
+    rho = density, kg/m^3
+    cp = specific heat capacity, J/kg*K
+    kin = dictionary of kinetic parameters, see kinetics
+    """
+    k = rates(T, kin)
+    K1 = np.maximum(k[0] + k[1] + k[2], 1e-300)     # wood consumption rate
+    K2 = np.maximum(k[3] + k[4], 1e-300)            # tar consumption rate
+    e1 = np.exp(-K1*dt)
+
+    # tar formed at rate k2*wood and consumed at rate K2*tar where
+    # (e1 - e2)/(K2 - K1) = e1*dt*phi with phi = (1 - exp(-x))/x and
+    # x = (K2 - K1)*dt
+    x = (K2 - K1)*dt
+    x = np.where(x == 0, 1e-300, x)
+    phi = -np.expm1(-x)/x
+
+    w = Y[0]*e1
+    tar = Y[2]*np.exp(-K2*dt) + k[1]*Y[0]*e1*dt*phi
+    dw = Y[0] - w                       # wood consumed
+    dtar = Y[2] + dw*k[1]/K1 - tar      # tar consumed
+
+    # products split by the ratio of each rate to the total rate
+    fw = dw/K1
+    ft = dtar/K2
+    Y = np.stack((w, Y[1] + fw*k[0] + ft*k[3], tar, Y[3] + fw*k[2] + ft*k[4]))
+
+    T = T - (kin['dH1']*dw + kin['dH2']*dtar)/(rho*cp)
+    return T, Y
+
+# Coupled Conduction and Kinetics Solver
+# -----------------------------------------------------------------------------
+
+def solve(b, rho, cp, k, h, d, Ti, Tinf, tmax, nt, nr, kin=kinetics,
+          dtype=np.float64, acc=None):
+    """
+    Returns the temperature array TT where row = time step, column = node and
+    the concentration array YY with the species along the second axis. The
+    particle parameters may be arrays of n particles in which case TT and YY
+    have a last axis for the particles.
+    b = shape factor where 2 sphere, 1 cylinder
+    rho = density of wood, kg/m^3
+    cp = specific heat capacity, J/kg*K
+    k = thermal conductivity, W/m*K
+    h = heat transfer coefficient, W/m^2*K
+    d = particle diameter, m
+    Ti = initial particle temp, K
+    Tinf = ambient temp as a constant or one value per time row, K
+    tmax = max time, s
+    nt = number of time steps
+    nr = number of radius steps
+    kin = dictionary of kinetic parameters, see kinetics
+    dtype = float type of the stored TT and YY, float64 or float32
+    acc = float type of the factors and of the current state carried from
+          step to step, same as dtype if None, see implicit.py
+    """
+    acc = dtype if acc is None else acc
+    m = nr+1
+    Fo, Bi, dt = params(rho, cp, k, h, d, tmax, nt, nr)
+    cc, dd, ee, g = coeffs(b, Fo, Bi, m)
+    lu = factor(cc, dd, ee, acc)
+    g = np.asarray(g, dtype=acc)
+    Tinf = ambient(Tinf, nt, np.shape(g))
+
+    TT = np.zeros((nt+1,) + dd.shape, dtype=dtype)
+    YY = np.zeros((nt+1, len(species)) + dd.shape, dtype=dtype)
+    TT[0] = Ti
+    YY[0, 0] = rho      # particle is all wood at t = 0
+    T = TT[0].astype(acc)
+    Y = YY[0].astype(acc)
+
+    for i in range(1, nt+1):
+        T, Y = react(T, Y, dt/2, rho, cp, kin)
+        C = T.astype(acc)
+        C[m-1] = C[m-1] + g*Tinf[i]
+        T = backsolve(lu, C)
+        T, Y = react(T, Y, dt/2, rho, cp, kin)
+        TT[i], YY[i] = T, Y
+
+    return TT, YY
@@ -0,0 +1,144 @@
+"""
+Selects the number of radius steps nr and time steps nt for the implicit
+numerical solution of 1D transient heat conduction in a solid sphere or
+cylinder from a requested tolerance on theta = (T - Tinf)/(Ti - Tinf) at the
+center and surface. The error of the scheme is modeled as
+
+    err(nr, nt) = Cr*nr^-pr + Ct*nt^-pt
+
+where the orders pr and pt and the constants are estimated by Richardson
+extrapolation from a short ladder of runs that double nr at a fixed nt and
+double nt at a fixed nr. The differences between levels remove the error of
+the other direction, so each ladder only measures its own error. The cheapest
+(nr, nt) with err <= tol is the one with the smallest nr*nt. The selected
+grid is then checked against the analytical solution funcTheta.theta and
+doubled in nr and nt until it meets the tolerance there too. The measured
+orders are close to pr = 1 (from the surface node) and pt = 1
+(backward Euler), e.g. theta within 1e-3 for the sphere at Bi = 0.625 needs
+about nr = 1400 with nt = 2000.
+
+Results are cached for each (b, Bi, Fo range, tol) so repeated calls of a
+sweep only run the ladder once.
+
+Functions:
+implicit.py returns the solution for the grid Fourier and Biot numbers
+funcTheta.py in the analytical folder returns the analytical theta
+folders.py adds the analytical folder to the module search path
+resolution <- implicit, funcTheta, folders
+
+References:
+1) Ozisik 1993, Ch.12, pg.459
+2) Roache 1998, Verification and validation in computational science and
+   engineering, Ch.5
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import functools
+import numpy as np
+import folders
+from implicit import solve
+
+folders.add('analytical')
+from funcTheta import theta
+
+# Solution at the Sample Times
+# -----------------------------------------------------------------------------
+
+def sample(b, Bi, Fo, nr, nt, ns=20):
+    """
+    Returns theta at the center and surface with shape (ns, 2) at ns sample
+    times equally spaced from Fo[0] to Fo[1].
+    b = shape factor where 2 sphere, 1 cylinder
+    Bi = Biot number h*ro/k, (-)
+    Fo = (min, max) Fourier number alpha*t/ro^2 of the samples, (-)
+    nr = number of radius steps
+    nt = number of time steps to Fo[1]
+    ns = number of sample times
+    """
+    Fos = np.linspace(Fo[0], Fo[1], ns)
+    TT = solve(b, Fo[1]/nt*nr**2, Bi/nr, 1, 0, nr+1, nt)
+    t = np.linspace(0, Fo[1], nt+1)
+    return np.column_stack([np.interp(Fos, t, TT[:, 0]),
+                            np.interp(Fos, t, TT[:, nr])])
+
+def richardson(u):
+    """
+    Returns the order p and the constant C of err = C*n^-p from the solutions
+    u at n, 2n and 4n, the error is the largest over all samples.
+    u = list of three solutions at n, 2n, 4n
+    """
+    d1 = np.abs(u[0] - u[1]).max()
+    d2 = np.abs(u[1] - u[2]).max()
+    p = np.clip(np.log2(d1/max(d2, 1e-300)), 0.5, 4)
+    err = d2/(2**p - 1)     # error of the finest level
+    return p, err
+
+# Grid Selection
+# -----------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=256)
+def cachedSelect(b, Bi, Fo, tol, nr0=20, nt0=200, ns=20, nref=4):
+    """
+    Returns the result of select, cached for each set of arguments, which
+    must be hashable so Fo is a tuple.
+    """
+    # ladders in nr at nt = 4*nt0 and in nt at nr = 4*nr0
+    ur = [sample(b, Bi, Fo, nr0*2**i, 4*nt0, ns) for i in range(3)]
+    ut = [sample(b, Bi, Fo, 4*nr0, nt0*2**i, ns) for i in range(3)]
+    pr, er = richardson(ur)
+    pt, et = richardson(ut)
+    Cr = er*(4*nr0)**pr
+    Ct = et*(4*nt0)**pt
+
+    # smallest nt for each nr so the modeled error is at most tol
+    nr = np.unique(np.geomspace(5, 10000, 200).astype(int))
+    et = tol - Cr*nr.astype(float)**-pr
+    ok = et > 0
+    if not ok.any():
+        raise ValueError('tolerance is not reached with nr <= 10000')
+    nr = nr[ok]
+    nt = np.ceil((Ct/et[ok])**(1/pt)).astype(int)
+    best = np.argmin(nr*nt)
+    nr, nt = int(nr[best]), int(nt[best])
+    err = float(Cr*nr**-pr + Ct*nt**-pt)
+
+    # check against the analytical solution, the grid is doubled in nr and
+    # nt while the error is above tol since both orders are about 1
+    z = np.arange(0, 1250, 0.01)    # range to evaluate the zeta, Bi equation
+    z[0] = 1e-12                    # prevent divide by zero warning
+    Fos = np.linspace(Fo[0], Fo[1], ns)
+    exact = np.column_stack([theta(1e-12, b, z, Bi, Fos),
+                             theta(1, b, z, Bi, Fos)])
+    for i in range(nref+1):
+        dev = float(np.abs(sample(b, Bi, Fo, nr, nt, ns) - exact).max())
+        if dev <= tol:
+            break
+        if i == nref or 2*nr > 10000:
+            raise ValueError('error %.3g against the analytical solution is '
+                             'above tol with nr = %d, nt = %d' % (dev, nr, nt))
+        nr, nt = 2*nr, 2*nt
+
+    return {'nr': nr, 'nt': nt, 'pr': float(pr), 'pt': float(pt),
+            'err': err, 'exact': dev}
+
+def select(b, Bi, Fo, tol, nr0=20, nt0=200, ns=20, nref=4):
+    """
+    Returns a dictionary with the cheapest 'nr' and 'nt' for the tolerance,
+    the orders 'pr' and 'pt', the modeled error 'err' of the selected ladder
+    grid and the error 'exact' of the returned grid against the analytical
+    solution. If the selected grid misses tol against the analytical
+    solution it is doubled in nr and nt up to nref times, then ValueError is
+    raised, so the returned grid always meets tol.
+    b = shape factor where 2 sphere, 1 cylinder
+    Bi = Biot number h*ro/k, (-)
+    Fo = (min, max) Fourier number alpha*t/ro^2 where the error is measured,
+         Fo[0] > 0 since theta is discontinuous at Fo = 0
+    tol = tolerance on theta at the center and surface, (-)
+    nr0, nt0 = coarsest level of the ladders
+    ns = number of sample times
+    nref = max number of refinements after the analytical check
+    """
+    Fo = (float(Fo[0]), float(Fo[1]))
+    return cachedSelect(b, float(Bi), Fo, float(tol), nr0, nt0, ns, nref)
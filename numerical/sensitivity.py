@@ -0,0 +1,85 @@
+"""
+Forward sensitivity of the implicit numerical solution of 1D transient heat
+conduction in a solid sphere or cylinder to the parameters h, k, cp, rho and d.
+
+The discrete system at each time step is [A]{T} = {T_old} + g*Tinf*{e} where
+[A] = [I] + Fo*[K] + Fo*Bi*s*{e}{e}^T depends only on Fo and Bi. Taking the
+derivative with respect to a parameter p gives
+
+    [A]{S} = {S_old} + dg/dp*Tinf*{e} - d[A]/dp*{T}
+
+for the sensitivity {S} = d{T}/dp. This uses the same decomposed [A] as the
+temperature so all five sensitivities cost about one extra solve per step.
+Derivatives are taken at a fixed node index, i.e. at a fixed r/ro.
+
+Functions:
+implicit.py returns the grid Fourier and Biot numbers
+tridiag.py returns the diagonals of [A] and the tridiagonal LU functions
+sensitivity <- implicit, tridiag
+
+Reference:
+Ozisik 1993, Ch.12, pg.459
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import numpy as np
+from implicit import params
+from tridiag import coeffs, factor, backsolve, matvec
+
+# parameters in the order of the last axis of the sensitivity array
+names = ('h', 'k', 'cp', 'rho', 'd')
+
+# Sensitivity Function
+# -----------------------------------------------------------------------------
+
+def sensitivity(b, rho, cp, k, h, d, Ti, Tinf, tmax, nt, nr):
+    """
+    Returns the temperature array TT with shape (nt+1, m) and a dictionary of
+    sensitivity arrays dT/dp with the same shape for p in names.
+    b = shape factor where 2 sphere, 1 cylinder
+    rho = density, kg/m^3
+    cp = specific heat capacity, J/kg*K
+    k = thermal conductivity, W/m*K
+    h = heat transfer coefficient, W/m^2*K
+    d = particle diameter, m
+    Ti = initial particle temp, K
+    Tinf = ambient temp, K
+    tmax = max time, s
+    nt = number of time steps
+    nr = number of radius steps
+    """
+    m = nr+1
+    Fo, Bi, dt = params(rho, cp, k, h, d, tmax, nt, nr)
+
+    # derivatives of Fo = k*dt/(rho*cp*dr^2) and Bi = h*dr/k where dr ~ d
+    dFo = np.array([0, Fo/k, -Fo/cp, -Fo/rho, -2*Fo/d])
+    dBi = np.array([Bi/h, -Bi/k, 0, 0, Bi/d])
+
+    cc, dd, ee, g = coeffs(b, Fo, Bi, m)
+    s = g/(Fo*Bi)                   # surface factor 2*(1 + b/(2*m))
+    dg = s*(dFo*Bi + Fo*dBi)        # derivative of g for each parameter
+
+    lu = factor(cc, dd, ee)
+
+    TT = np.zeros((nt+1, m))
+    TT[0] = Ti
+    SS = np.zeros((nt+1, m, len(names)))    # dT/dp is zero at t = 0
+
+    for i in range(1, nt+1):
+        C = TT[i-1].copy()
+        C[m-1] = C[m-1] + g*Tinf
+        T = backsolve(lu, C)
+        TT[i] = T
+
+        # d[A]/dp*{T} = dFo/Fo*([A]{T} - {T}) + dBi*Fo*s*T[m-1]*{e}
+        dAT = np.outer(matvec(cc, dd, ee, T) - T, dFo/Fo)
+        dAT[m-1] += dBi*Fo*s*T[m-1]
+
+        S = SS[i-1] - dAT
+        S[m-1] += dg*Tinf
+        SS[i] = backsolve(lu, S)
+
+    dTT = {p: SS[:, :, j] for j, p in enumerate(names)}
+    return TT, dTT
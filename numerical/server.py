@@ -0,0 +1,362 @@
+"""
+Local asyncio service that returns particle temperature histories from the
+lumped, analytical and numerical models to another process. Clients connect
+to a Unix socket or a localhost TCP port and send one JSON request per line
+
+    {"id": 1, "model": "analytical", "b": 2, "rho": 700, "cp": 1500,
+     "k": 0.105, "h": 375, "d": 0.00035, "Ti": 300, "Tinf": 773,
+     "t": [0.1, 0.2, 0.4], "r": [0, 1]}
+
+and receive one JSON line {"id": 1, "T": [[...], ...]} with one row for each
+t and one column for each r (one value per t for the lumped model), or
+{"id": 1, "error": "..."}. Responses may come back in a different order than
+the requests when several are in flight on one connection.
+
+Requests that are already read when the first of a batch is taken, or that
+arrive within an optional wait, are collected in a micro-batch, grouped by
+model, b, t, r and grid, and each group is solved for all of its particles at
+once:
+
+lumped      - lumped capacitance, T = Tinf + (Ti - Tinf)*exp(-t/tau)
+analytical  - series solution with the roots of all particles from rootsArray
+table       - interpolation of a funcTable table given when the server starts
+numerical   - implicit.solve with one batch of per-particle diagonals, with
+              optional "nr" and "nt" in the request (default 49 and 500)
+
+The roots of each (b, Bi) and the table stay in memory between batches, so
+repeated particles only evaluate the series. On a Unix socket one request
+takes about 0.2 ms for the analytical model and pipelined requests about
+0.1 ms (analytical) and 0.35 ms (numerical, nr = 49, nt = 500) each. A wait
+above 0 adds at least 1 ms to a batch since asyncio timers resolve to about
+1 ms, so it only helps clients that send requests in bursts.
+
+Functions:
+implicit.py returns the grid Fourier and Biot numbers and the solution
+funcRoots.py in the analytical folder returns the roots for arrays of Bi
+funcTheta.py in the analytical folder returns the terms of the series
+funcTable.py in the analytical folder loads and queries a table
+folders.py adds the analytical folder to the module search path
+server <- implicit, funcRoots, funcTheta, funcTable, folders
+
+References:
+1) Bergman, Lavine, Incropera, Dewitt 2011, Ch. 5, pg. 280-286 and 299-304
+2) Ozisik 1993, Ch.12, pg.459
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import asyncio
+import json
+import socket
+import sys
+import numpy as np
+import folders
+from implicit import params, solve
+
+folders.add('analytical')
+from funcRoots import rootsArray
+from funcTheta import funcCn, funcDn
+from funcTable import loadTable, query
+
+nroots = 100    # number of roots of the analytical series
+modes = {}      # roots for each (b, Bi), kept between batches
+table = None    # table from funcTable.loadTable if the server has one
+
+# Vectorized Models
+# -----------------------------------------------------------------------------
+
+def lumped(b, p, t, r):
+    """
+    Returns the lumped capacitance temperature with shape (n, len(t)).
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    p = dictionary of parameter arrays with shape (n, 1), see evaluate
+    t = times, s
+    r = dimensionless radii, not used
+    """
+    Lc = (p['d']/2)/(b+1)               # volume/area, m
+    tau = p['rho']*p['cp']*Lc/p['h']    # thermal time constant, s
+    return p['Tinf'] + (p['Ti'] - p['Tinf'])*np.exp(-t/tau)
+
+def temperature(p, th):
+    """
+    Returns the temperature with shape (n, len(t), len(r)) from theta.
+    p = dictionary of parameter arrays with shape (n, 1), see evaluate
+    th = theta with shape (n, len(t), len(r)), (-)
+    """
+    Ti = p['Ti'][:, :, np.newaxis]
+    Tinf = p['Tinf'][:, :, np.newaxis]
+    return Tinf + (Ti - Tinf)*th
+
+def roots(b, Bi):
+    """
+    Returns the first nroots roots for each Bi with shape (n, nroots), only
+    the Bi that are not in modes are solved and they are solved together.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    Bi = array of Biot numbers, (-)
+    """
+    new = np.unique([x for x in Bi if (b, x) not in modes])
+    if len(new) > 0:
+        if len(modes) > 100000:
+            modes.clear()
+        for x, rts in zip(new, rootsArray(nroots, b, new)):
+            modes[b, x] = rts
+    return np.array([modes[b, x] for x in Bi])
+
+def analytical(b, p, t, r):
+    """
+    Returns the series solution with shape (n, len(t), len(r)).
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    p = dictionary of parameter arrays with shape (n, 1), see evaluate
+    t = times, s
+    r = dimensionless radii, (-)
+    """
+    ro = p['d'][:, 0]/2
+    Bi = p['h'][:, 0]*ro/p['k'][:, 0]
+    Fo = p['k']/(p['rho']*p['cp'])*t/ro[:, np.newaxis]**2
+    rts = roots(b, Bi)
+    Cn = funcCn(rts, b)
+    Dn = funcDn(np.maximum(r, 1e-12)[np.newaxis, np.newaxis, :],
+                rts[:, :, np.newaxis], b)
+    En = np.exp(-rts[:, np.newaxis, :]**2 * Fo[:, :, np.newaxis])
+    th = np.einsum('itn,in,inr->itr', En, Cn, Dn)
+    th[Fo == 0] = 1     # uniform initial temperature at t = 0
+    return temperature(p, th)
+
+def tabulated(b, p, t, r):
+    """
+    Returns the table interpolation with shape (n, len(t), len(r)).
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    p = dictionary of parameter arrays with shape (n, 1), see evaluate
+    t = times, s
+    r = dimensionless radii, (-)
+    """
+    if table is None:
+        raise ValueError('server was started without a table')
+    ro = p['d']/2
+    Bi = (p['h']*ro/p['k'])[:, :, np.newaxis]
+    Fo = (p['k']/(p['rho']*p['cp'])*t/ro**2)[:, :, np.newaxis]
+    th = query(table, b, r, np.maximum(Fo, 1e-300), Bi)
+    th = np.where(Fo == 0, 1, th)   # uniform initial temperature at t = 0
+    return temperature(p, th)
+
+def numerical(b, p, t, r, nr=49, nt=500):
+    """
+    Returns the implicit numerical solution with shape (n, len(t), len(r)),
+    linear interpolation between the time steps and the nodes.
+    b = shape factor where 2 sphere, 1 cylinder
+    p = dictionary of parameter arrays with shape (n, 1), see evaluate
+    t = times, s
+    r = dimensionless radii, (-)
+    nr = number of radius steps
+    nt = number of time steps to the largest t
+    """
+    if t.max() == 0:
+        # all times at t = 0, the uniform initial temperature
+        return temperature(p, np.ones((len(p['h']), len(t), len(r))))
+    pp = {n: v[:, 0] for n, v in p.items()}
+    if len(pp['h']) == 1:
+        pp = {n: v[0] for n, v in pp.items()}
+    Fo, Bi, dt = params(pp['rho'], pp['cp'], pp['k'], pp['h'], pp['d'],
+                        t.max(), nt, nr)
+    TT = solve(b, Fo, Bi, 1, 0, nr+1, nt).reshape((nt+1, nr+1, -1))
+
+    # fractional time step and node of each t and r
+    def index(v, n):
+        s = np.clip(v*n, 0, n)
+        i = np.minimum(s.astype(int), n-1)
+        return i, (s - i)[:, np.newaxis]
+    i, fi = index(t/t.max(), nt)
+    j, fj = index(np.asarray(r), nr)
+    th = TT[i]*(1 - fi[:, :, np.newaxis]) + TT[i+1]*fi[:, :, np.newaxis]
+    th = th[:, j]*(1 - fj) + th[:, j+1]*fj
+    th = th.transpose(2, 0, 1)
+    return temperature(p, th)
+
+models = {'lumped': lumped, 'analytical': analytical, 'table': tabulated,
+          'numerical': numerical}
+names = ('rho', 'cp', 'k', 'h', 'd', 'Ti', 'Tinf')
+
+def check(req):
+    """
+    Raises ValueError if a decoded request line is not a valid request.
+    req = decoded JSON value of the line
+    """
+    if not isinstance(req, dict):
+        raise ValueError('request must be a JSON object')
+    if req.get('model') not in models:
+        raise ValueError('model must be one of %s' % ', '.join(models))
+    if req.get('b', 2) not in (0, 1, 2):
+        raise ValueError('b must be 0, 1 or 2')
+    for n in names:
+        if n not in req:
+            raise ValueError('missing field %s' % n)
+        float(req[n])
+    for n in ('t', 'r'):
+        if n in req:
+            v = np.array(req[n], dtype=float)
+            if v.ndim != 1 or len(v) == 0 or not np.all(np.isfinite(v)):
+                raise ValueError('%s must be a list of numbers' % n)
+            if np.any(v < 0):
+                raise ValueError('%s must not be negative' % n)
+    if 't' not in req:
+        raise ValueError('missing field t')
+    for n in ('nr', 'nt'):
+        if req.get(n) is not None and (not isinstance(req[n], int)
+                                       or req[n] < 1):
+            raise ValueError('%s must be a positive integer' % n)
+
+def evaluate(reqs):
+    """
+    Returns a list with the temperatures for each request, or the exception
+    of its group. Requests with the same model, b, t, r and grid are solved
+    together.
+    reqs = list of request dictionaries
+    """
+    out = [None]*len(reqs)
+    groups = {}
+    for i, q in enumerate(reqs):
+        try:
+            key = (q['model'], q.get('b', 2), tuple(q['t']),
+                   tuple(q.get('r', (0, 1))), q.get('nr'), q.get('nt'))
+            hash(key)
+        except Exception as e:
+            out[i] = e      # a bad request only fails its own future
+            continue
+        groups.setdefault(key, []).append(i)
+
+    for (model, b, t, r, nr, nt), idx in groups.items():
+        try:
+            p = {n: np.array([[float(reqs[i][n])] for i in idx])
+                 for n in names}
+            t = np.array(t, dtype=float)
+            r = np.array(r, dtype=float)
+            kw = {n: v for n, v in (('nr', nr), ('nt', nt)) if v is not None}
+            T = models[model](b, p, t, r, **kw)
+            for i, Ti in zip(idx, T):
+                out[i] = Ti
+        except Exception as e:
+            for i in idx:
+                out[i] = e
+    return out
+
+# Micro-Batching Server
+# -----------------------------------------------------------------------------
+
+async def batcher(queue, wait, maxbatch):
+    """
+    Collects the requests that are on the queue after wait, up to maxbatch,
+    and evaluates them. The batch is evaluated in the event loop
+    since the models hold the GIL, requests that arrive meanwhile wait in the
+    socket buffers and go into the next batch.
+    queue = queue of (request, future)
+    wait = time to wait for more requests, 0 to only let the requests already
+           read join the batch, s
+    maxbatch = max number of requests in a batch
+    """
+    while True:
+        items = [await queue.get()]
+        await asyncio.sleep(wait)
+        while len(items) < maxbatch and not queue.empty():
+            items.append(queue.get_nowait())
+        try:
+            res = evaluate([q for q, f in items])
+        except Exception as e:
+            res = [e]*len(items)
+        for (q, f), x in zip(items, res):
+            if f.cancelled():
+                continue
+            if isinstance(x, Exception):
+                f.set_exception(x)
+            else:
+                f.set_result(x)
+
+async def answer(line, queue, writer):
+    """
+    Puts one request line on the queue and writes its response line.
+    line = JSON request, see above
+    queue = queue of (request, future)
+    writer = stream of the connection
+    """
+    req = {}
+    try:
+        req = json.loads(line)
+        check(req)
+        fut = asyncio.get_running_loop().create_future()
+        await queue.put((req, fut))
+        res = {'id': req.get('id'), 'T': (await fut).tolist()}
+    except Exception as e:
+        rid = req.get('id') if isinstance(req, dict) else None
+        res = {'id': rid, 'error': repr(e)}
+    writer.write((json.dumps(res) + '\n').encode())
+
+async def serve(path=None, host='127.0.0.1', port=8765, wait=0,
+                maxbatch=1024, tablepath=None):
+    """
+    Runs the server until it is cancelled.
+    path = Unix socket path, a localhost TCP port is used if None
+    host, port = TCP address when path is None
+    wait = time to wait for more requests after the first of a batch, s
+    maxbatch = max number of requests in a batch
+    tablepath = file name of a funcTable table without extension, optional
+    """
+    global table
+    if tablepath is not None:
+        table = loadTable(tablepath)
+
+    queue = asyncio.Queue()
+
+    async def handle(reader, writer):
+        tasks = set()
+        while line := await reader.readline():
+            task = asyncio.create_task(answer(line, queue, writer))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+        writer.close()
+
+    if path is not None:
+        server = await asyncio.start_unix_server(handle, path)
+    else:
+        server = await asyncio.start_server(handle, host, port)
+    batch = asyncio.create_task(batcher(queue, wait, maxbatch))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        batch.cancel()
+
+# Blocking Client
+# -----------------------------------------------------------------------------
+
+def connect(path=None, host='127.0.0.1', port=8765):
+    """
+    Returns a socket file of a connection to the server for request.
+    path = Unix socket path, a localhost TCP port is used if None
+    host, port = TCP address when path is None
+    """
+    if path is not None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+    else:
+        sock = socket.create_connection((host, port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock.makefile('rwb')
+
+def request(f, **req):
+    """
+    Returns the temperatures for one request as an array, see above.
+    f = socket file from connect
+    req = request fields
+    """
+    f.write((json.dumps(req) + '\n').encode())
+    f.flush()
+    res = json.loads(f.readline())
+    if 'error' in res:
+        raise RuntimeError(res['error'])
+    return np.array(res['T'])
+
+if __name__ == '__main__':
+    # python server.py [socket path [table path]]
+    args = sys.argv[1:] + [None]*2
+    asyncio.run(serve(path=args[0], tablepath=args[1]))
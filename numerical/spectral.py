@@ -0,0 +1,167 @@
+"""
+Chebyshev spectral collocation solution of 1D transient heat conduction in a
+solid sphere, cylinder or slab with convection at the surface and no heat of
+reaction. Same model and parameters as num_sphere.py but the temperature is
+a polynomial in r through m collocation points instead of a finite difference
+grid of nr+1 nodes.
+
+The profile is even in r (symmetric about the center), so the Chebyshev
+points of [-1, 1] are folded onto 0 <= r <= 1 and the derivative matrices act
+only on the m points with r >= 0. The center point uses the limit
+b/r*dT/dr -> b*d2T/dr2 at r = 0, and the Robin condition at the surface
+
+    dT/dr + Bi*T = Bi*Tinf,  Bi = h*ro/k
+
+eliminates the surface temperature, which leaves a linear system
+dU/dt = alpha/ro^2*[A]{U} for U = T - Tinf at the other m-1 points. The small
+dense matrix is exponentiated once per run, [P] = expm(alpha*dt/ro^2*[A]),
+and every time step is one matrix product, exact in time for an ambient
+temp that is constant over the step. For the reference case of num_sphere.py
+(tmax = 0.8 s) the max difference from funcTheta.py is 2e-11 K with m = 16
+and 0.45 K for implicit.py with nr = 99 and nt = 1000, and m = 16 is within
+1e-10 K already at t = 0.01 s.
+
+Functions:
+implicit.py returns the ambient temp for each row of TT
+spectral <- implicit
+
+Reference:
+Trefethen 2000, Spectral Methods in MATLAB, Ch. 6 and 11
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import numpy as np
+import scipy.linalg as sp
+from implicit import ambient
+
+# Collocation Points and Matrices
+# -----------------------------------------------------------------------------
+
+def cheb(N):
+    """
+    Returns the Chebyshev differentiation matrix and the points
+    x = cos(pi*j/N) of [-1, 1] from x = 1 to x = -1.
+    N = polynomial degree
+    """
+    x = np.cos(np.pi*np.arange(N+1)/N)
+    c = np.ones(N+1)
+    c[0] = c[N] = 2
+    c = c*(-1)**np.arange(N+1)
+    dX = x[:, None] - x[None, :]
+    D = np.outer(c, 1/c)/(dX + np.eye(N+1))
+    D = D - np.diag(D.sum(axis=1))
+    return D, x
+
+def grid(b, m):
+    """
+    Returns the collocation points r from center r = 0 to surface r = 1, the
+    first derivative matrix and the matrix of the operator
+    d2T/dr2 + (b/r)*dT/dr for an even profile.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    m = number of collocation points from center to surface
+    """
+    N = 2*(m-1)
+    D, x = cheb(N)
+    D2 = D @ D
+
+    # fold T(-r) = T(r) onto the points with x >= 0
+    j = np.arange(m-1)
+    D1 = D[:m, :m].copy()
+    D1[:, j] += D[:m, N-j]
+    L = D2[:m, :m].copy()
+    L[:, j] += D2[:m, N-j]
+
+    # order from center to surface
+    idx = np.arange(m-1, -1, -1)
+    r = x[idx]
+    r[0] = 0
+    D1 = D1[np.ix_(idx, idx)]
+    L = L[np.ix_(idx, idx)]
+    L[1:] += b/r[1:, None]*D1[1:]
+    L[0] *= 1 + b
+    return r, D1, L
+
+def weights(b, m):
+    """
+    Returns quadrature weights for the volume average of the collocated
+    profile, sum(w*T) = (b+1)*integral(T*r^b dr) with r = 0 to 1, exact for
+    the even polynomial through the points.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    m = number of collocation points from center to surface
+    """
+    r = grid(b, m)[0]
+    xg, wg = np.polynomial.legendre.leggauss(2*m + 2)
+    xg = (xg + 1)/2
+    wg = wg/2
+    k = 2*np.arange(m)
+    V = np.polynomial.chebyshev.chebvander(r, k[-1])[:, k]
+    mom = (np.polynomial.chebyshev.chebvander(xg, k[-1])[:, k]
+           * ((b+1)*xg**b*wg)[:, None]).sum(axis=0)
+    return np.linalg.solve(V.T, mom)
+
+def operator(b, Bi, m):
+    """
+    Returns the matrix [A] of dU/dt = [A]{U} in dimensionless time at the
+    m-1 points without the surface and the row that gives the surface
+    temperature, U_s = row @ U. Bi may be an array of n particles in which
+    case the matrices have a first axis for the particles.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    Bi = Biot number h*ro/k, (-)
+    m = number of collocation points from center to surface
+    """
+    r, D1, L = grid(b, m)
+    Bi = np.asarray(Bi, dtype=float)[..., None, None]
+    row = -D1[m-1:, :m-1]/(D1[m-1, m-1] + Bi)     # U_s from the Robin BC
+    A = L[:m-1, :m-1] + L[:m-1, m-1:] @ row
+    return A, row[..., 0, :]
+
+# Spectral Solver
+# -----------------------------------------------------------------------------
+
+def solve(b, rho, cp, k, h, d, Ti, Tinf, tmax, nt, m=16):
+    """
+    Returns the temperature array TT where row = time step, column = point
+    at the radii of grid(b, m)[0]. The particle parameters may be arrays of n
+    particles in which case TT has a third axis for the particles, TT[:, 0]
+    is the center and TT[:, m-1] is the surface.
+    b = shape factor where 2 sphere, 1 cylinder, 0 slab
+    rho = density, kg/m^3
+    cp = specific heat capacity, J/kg*K
+    k = thermal conductivity, W/m*K
+    h = heat transfer coefficient, W/m^2*K
+    d = particle diameter or slab thickness, m
+    Ti = initial particle temp, K
+    Tinf = ambient temp as a constant or an array with time along the first
+           axis, shape (nt+1,) or (nt+1, n), row i is used for time step i, K
+    tmax = max time, s
+    nt = number of time steps
+    m = number of collocation points from center to surface
+    """
+    dt = tmax/nt
+    ro = np.asarray(d)/2
+    Fo = k/(rho*cp)*dt/ro**2     # Fourier number of one step, (-)
+    Bi = h*ro/k                  # Biot number, h*ro/k, (-)
+    Fo, Bi = np.broadcast_arrays(Fo, Bi)
+    shape = Fo.shape
+
+    A, row = operator(b, Bi, m)
+    P = sp.expm(Fo[..., None, None]*A)   # computed once per run
+    Tinf = ambient(Tinf, nt, shape)
+
+    TT = np.zeros((nt+1, m) + shape)
+    TT[0] = Ti      # first row is initial temperature of sphere or cylinder
+    T = TT[0, :m-1]
+
+    for i in range(1, nt+1):
+        U = T - Tinf[i]
+        if shape:
+            U = np.einsum('nij,jn->in', P, U)
+            TT[i, m-1] = Tinf[i] + np.einsum('nj,jn->n', row, U)
+        else:
+            U = P @ U
+            TT[i, m-1] = Tinf[i] + row @ U
+        T = TT[i, :m-1] = Tinf[i] + U
+
+    return TT
@@ -0,0 +1,133 @@
+"""
+Implicit numerical solution of 1D transient heat conduction in a solid sphere
+or cylinder with a nonlinear heat flux at the surface and no heat of
+reaction. The surface flux into the particle is
+
+    q(Ts) = h(Ts)*(Tinf - Ts) + eps*sigma*(Tw^4 - Ts^4)
+
+with a heat transfer coefficient that may depend on the surface temperature.
+The surface row of num_sphere.py is written with the flux as
+
+    (1 + 2*Fo)*Ts - 2*Fo*Tr-1 = Ts_old + 2*Fo*(1 + b/(2*m))*(dr/k)*q(Ts)
+
+which is the linear row when q = h*(Tinf - Ts). The matrix [A0] without the
+flux term is factored once per run and {z} = [A0]^-1{e} is solved once, then
+every step solves {y} = [A0]^-1{T_old} and the temperatures are
+
+    {T} = {y} + gam*q(Ts)*{z},  gam = 2*Fo*(1 + b/(2*m))*dr/k
+
+so Ts = y[m-1] + gam*z[m-1]*q(Ts) is one equation for each particle, solved by
+Newton iterations on all particles at once. The nonlinear step costs one
+tridiagonal solve and a few scalar iterations, the same as the linear case.
+
+Functions:
+implicit.py returns the grid Fourier number and the ambient temp
+tridiag.py returns the diagonals of [A] and the tridiagonal LU functions
+surface <- implicit, tridiag
+
+Reference:
+Ozisik 1993, Ch.12, pg.459
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import numpy as np
+from implicit import params, ambient
+from tridiag import coeffs, factor, backsolve
+
+sigma = 5.670374419e-8  # Stefan-Boltzmann constant, W/m^2*K^4
+
+# Surface Heat Flux
+# -----------------------------------------------------------------------------
+
+def flux(Ts, h, Tinf, Tw, es):
+    """
+    Returns the heat flux into the surface and its derivative with respect to
+    the surface temperature, W/m^2 and W/m^2*K.
+    Ts = surface temperature, K
+    h = heat transfer coefficient as a constant or a function h(Ts), W/m^2*K
+    Tinf = ambient temp, K
+    Tw = radiation temperature of the surroundings, K
+    es = emissivity times sigma, W/m^2*K^4
+    """
+    if callable(h):
+        dT = 1e-6*np.abs(Ts) + 1e-6
+        hs = h(Ts)
+        dh = (h(Ts + dT) - hs)/dT
+    else:
+        hs = h
+        dh = 0
+    q = hs*(Tinf - Ts) + es*(Tw**4 - Ts**4)
+    dq = dh*(Tinf - Ts) - hs - 4*es*Ts**3
+    return q, dq
+
+# Implicit Solver
+# -----------------------------------------------------------------------------
+
+def solve(b, rho, cp, k, h, d, Ti, Tinf, tmax, nt, nr, eps=0, Tw=None,
+          tol=1e-10, maxit=20):
+    """
+    Returns the temperature array TT where row = time step, column = node.
+    The particle parameters, a constant h and eps may be arrays of n particles
+    and Tinf and Tw may have a column per particle, in which case TT has a
+    third axis for the particles.
+    b = shape factor where 2 sphere, 1 cylinder
+    rho = density of wood, kg/m^3
+    cp = specific heat capacity, J/kg*K
+    k = thermal conductivity, W/m*K
+    h = heat transfer coefficient as a constant or a function h(Ts) of the
+        surface temperature, W/m^2*K
+    d = particle diameter, m
+    Ti = initial particle temp, K
+    Tinf = ambient temp as a constant or one value per time row, K
+    tmax = max time, s
+    nt = number of time steps
+    nr = number of radius steps
+    eps = emissivity of the surface, (-)
+    Tw = radiation temperature of the surroundings as a constant or one value
+         per time row, K, same as Tinf if None
+    tol = relative tolerance of the Newton iterations on Ts
+    maxit = max number of Newton iterations
+    """
+    m = nr+1
+    Fo = params(rho, cp, k, 1, d, tmax, nt, nr)[0]
+
+    # particles from the parameters, h, eps and the columns of Tinf and Tw
+    shape = np.broadcast_shapes(np.shape(Fo), np.shape(eps),
+                                () if callable(h) else np.shape(h),
+                                np.shape(Tinf)[1:],
+                                () if Tw is None else np.shape(Tw)[1:])
+    Fo = np.broadcast_to(Fo, shape)
+    cc, dd, ee = coeffs(b, Fo, 0, m)[:3]    # [A0] without the surface flux
+    lu = factor(cc, dd, ee)
+    gam = 2*Fo*(1 + b/(2*m))*(np.asarray(d)/2)/nr/k
+    es = eps*sigma
+    Tinf = ambient(Tinf, nt, shape)
+    Tw = Tinf if Tw is None else ambient(Tw, nt, shape)
+
+    # response of the nodes to a unit source at the surface node
+    e = np.zeros(dd.shape)
+    e[m-1] = 1
+    z = backsolve(lu, e)
+    gz = gam*z[m-1]
+
+    TT = np.zeros((nt+1,) + dd.shape)
+    TT[0] = Ti      # first row is initial temperature of sphere or cylinder
+
+    for i in range(1, nt+1):
+        y = backsolve(lu, TT[i-1].copy())
+
+        # Newton iterations on Ts = y[m-1] + gam*z[m-1]*q(Ts)
+        Ts = TT[i-1, m-1]
+        for it in range(maxit):
+            q, dq = flux(Ts, h, Tinf[i], Tw[i], es)
+            dTs = (Ts - y[m-1] - gz*q)/(1 - gz*dq)
+            Ts = Ts - dTs
+            if np.all(np.abs(dTs) <= tol*np.abs(Ts)):
+                break
+
+        q = flux(Ts, h, Tinf[i], Tw[i], es)[0]
+        TT[i] = y + gam*q*z
+
+    return TT
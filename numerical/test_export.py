@@ -0,0 +1,59 @@
+"""
+Round trip of the Parquet export in export.py, run with pytest from the
+numerical folder. The round trip tests are skipped when the optional
+dependency pyarrow is not installed.
+"""
+
+# Modules
+# -----------------------------------------------------------------------------
+
+import numpy as np
+import pytest
+import export
+
+# Tests
+# -----------------------------------------------------------------------------
+
+def test_require_without_pyarrow(monkeypatch):
+    monkeypatch.setattr(export, 'pa', None)
+    with pytest.raises(ImportError, match='pip install pyarrow'):
+        export.Writer('unused.parquet')
+
+def test_sweep_round_trip(tmp_path):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'sweep.parquet')
+    t = np.linspace(0, 0.8, 6)
+    h = np.array([300., 350, 400, 450])
+    TT = 300 + np.outer(h, t)
+
+    def cases():
+        for i in (0, 2):
+            yield ({'h': h[i:i+2]}, {'Tend': TT[i:i+2, -1]},
+                   {'T': TT[i:i+2]})
+
+    assert export.sweep(path, cases(), {'t': t, 'b': 2}) == 4
+    tab, meta = export.read(path)
+    assert meta['b'] == 2
+    np.testing.assert_array_equal(meta['t'], t)
+    np.testing.assert_array_equal(tab.column('h').to_numpy(), h)
+    np.testing.assert_array_equal(export.series(tab, 'T'), TT)
+
+    tab, meta = export.read(path, columns=['h'], filters=[('h', '>', 320)])
+    np.testing.assert_array_equal(tab.column('h').to_numpy(), h[1:])
+
+def test_ensemble_round_trip(tmp_path):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'ensemble.parquet')
+    nt, n = 4, 5
+    t = np.linspace(0, 1, nt+1)
+    TT = np.random.default_rng(0).random((nt+1, 2, n))
+
+    rows = export.ensemble(path, TT, {'d': 350e-6, 'h': np.arange(n)}, t,
+                           r=(0, 1), chunk=2)
+    assert rows == n
+    tab, meta = export.read(path)
+    np.testing.assert_array_equal(meta['r'], [0, 1])
+    np.testing.assert_array_equal(export.series(tab, 'T_0'), TT[:, 0].T)
+    np.testing.assert_array_equal(export.series(tab, 'T_1'), TT[:, 1].T)
+    np.testing.assert_array_equal(tab.column('T_1_end').to_numpy(), TT[-1, 1])
+    np.testing.assert_array_equal(tab.column('d').to_numpy(), [350e-6]*n)
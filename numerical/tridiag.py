@@ -0,0 +1,140 @@
+"""
+Tridiagonal coefficients and Thomas (LU) solver for the implicit numerical
+solution of 1D transient heat conduction in a solid sphere or cylinder with
+convection at the surface. The discretization is the same one used in
+num_sphere.py, num_sphereLU.py and num_sphereSCIPY.py.
+
+Arrays are ordered with the node index first so the same functions work for a
+single particle, C with shape (m,) or (m, 1), or for a batch of particles,
+C with shape (m, n). Per-particle coefficients are given as diagonals with
+shape (m-1, n) and (m, n).
+
+A single set of diagonals is factored with LAPACK (gttrf) so each time step is
+one call to gttrs, while batches of per-particle diagonals use the Thomas
+algorithm vectorized over the particles. The factors are computed in the
+dtype given to factor (float64 or float32) and backsolve works in that dtype.
+
+Reference:
+Ozisik 1993, Ch.12, pg.459
+"""
+
+# Modules
+# -----------------------------------------------------------------------------
+
+import numpy as np
+from scipy.linalg import lapack
+
+# Coefficients
+# -----------------------------------------------------------------------------
+
+def coeffs(b, Fo, Bi, m):
+    """
+    Returns the lower, center and upper diagonals of [A] and the surface
+    coefficient g where C[m-1] = T[m-1] + g*Tinf for each time step.
+    b = shape factor where 2 sphere, 1 cylinder
+    Fo = Fourier number alpha*dt/dr^2, scalar or array of n particles, (-)
+    Bi = Biot number h*dr/k, scalar or array of n particles, (-)
+    m = number of nodes from center to surface
+    """
+    Fo, Bi = np.broadcast_arrays(np.asarray(Fo, dtype=float),
+                                 np.asarray(Bi, dtype=float))
+
+    # internal node index as a column when Fo and Bi are arrays
+    i = np.arange(1, m-1).reshape((-1,) + (1,)*Fo.ndim)
+
+    cc = np.zeros((m-1,) + Fo.shape)    # lower diagonal
+    dd = np.zeros((m,) + Fo.shape)      # center diagonal
+    ee = np.zeros((m-1,) + Fo.shape)    # upper diagonal
+
+    # center nodes T0 and T1
+    dd[0] = 1 + 2*(1+b)*Fo
+    ee[0] = -2*(1+b)*Fo
+
+    # internal nodes Tm-1, Tm, Tm+1
+    cc[0:m-2] = -Fo*(1 - b/(2*(i+1)))
+    dd[1:m-1] = 1 + 2*Fo
+    ee[1:m-1] = -Fo*(1 + b/(2*(i+1)))
+
+    # surface nodes Tr-1 and Tr
+    cc[m-2] = -2*Fo
+    dd[m-1] = 1 + 2*Fo*(1 + Bi + (b/(2*m))*Bi)
+    g = 2*Fo*Bi*(1 + b/(2*m))
+
+    return cc, dd, ee, g
+
+# Tridiagonal LU Decomposition and LU Solve
+# -----------------------------------------------------------------------------
+
+def LUdecomp(cc, dd, ee):
+    """
+    Overwrites the diagonals with the tridiagonal LU decomposition of [A].
+    cc, dd, ee = lower, center and upper diagonals of [A]
+    """
+    n = len(dd)
+    for k in range(1, n):
+        lam = cc[k-1] / dd[k-1]
+        dd[k] = dd[k] - lam*ee[k-1]
+        cc[k-1] = lam
+    return cc, dd, ee
+
+def LUsolve(cc, dd, ee, C):
+    """
+    Overwrites C with the solution of [A]{T} = {C} from the decomposed
+    diagonals returned by LUdecomp.
+    cc, dd, ee = decomposed diagonals of [A]
+    C = right-hand side with nodes along the first axis
+    """
+    n = len(dd)
+    for k in range(1, n):
+        C[k] = C[k] - cc[k-1]*C[k-1]
+    C[n-1] = C[n-1] / dd[n-1]
+    for k in range(n-2, -1, -1):
+        C[k] = (C[k] - ee[k]*C[k+1]) / dd[k]
+    return C
+
+def matvec(cc, dd, ee, T):
+    """
+    Returns the product [A]{T} for the (not decomposed) diagonals of [A].
+    cc, dd, ee = lower, center and upper diagonals of [A]
+    T = vector with nodes along the first axis
+    """
+    # extra trailing axes of T (e.g. several right-hand sides) broadcast
+    shape = (1,)*(np.ndim(T) - np.ndim(dd))
+    cc, dd, ee = [x.reshape(x.shape + shape) for x in (cc, dd, ee)]
+
+    AT = dd*T
+    AT[1:] += cc*T[:-1]
+    AT[:-1] += ee*T[1:]
+    return AT
+
+# Factor Once, Solve Every Time Step
+# -----------------------------------------------------------------------------
+
+def factor(cc, dd, ee, dtype=np.float64):
+    """
+    Returns the LU factors of [A] as a tuple for backsolve, the diagonals are
+    not overwritten.
+    cc, dd, ee = lower, center and upper diagonals of [A]
+    dtype = float type of the factors and of the solves, float64 or float32
+    """
+    cc, dd, ee = [np.array(x, dtype=dtype) for x in (cc, dd, ee)]
+    if np.ndim(dd) == 1:
+        gttrf, = lapack.get_lapack_funcs(('gttrf',), (dd,))
+        dl, d, du, du2, ipiv, info = gttrf(cc, dd, ee)
+        return dl, d, du, du2, ipiv
+    cc, dd, ee = LUdecomp(cc, dd, ee)
+    return cc, dd, ee, None, None
+
+def backsolve(lu, C):
+    """
+    Returns the solution of [A]{T} = {C} from the factors returned by factor.
+    lu = LU factors of [A]
+    C = right-hand side with nodes along the first axis in the dtype of the
+        factors, overwritten for a batch of per-particle diagonals
+    """
+    cc, dd, ee, du2, ipiv = lu
+    if ipiv is None:
+        return LUsolve(cc, dd, ee, C)
+    gttrs, = lapack.get_lapack_funcs(('gttrs',), (dd,))
+    T, info = gttrs(cc, dd, ee, du2, ipiv, C)
+    return T
@@ -0,0 +1,198 @@
+"""
+Monte Carlo uncertainty propagation for the implicit numerical solution of 1D
+transient heat conduction in a solid sphere or cylinder. Uncertain properties
+are sampled with a Latin hypercube or Sobol sequence, solved in batches, and
+the center and surface temperature histories are accumulated with streaming
+estimators so memory does not grow with the number of samples.
+
+Welford  - mean and variance, batches combined with the Chan et al. update
+TDigest  - quantiles from a merging t-digest with a fixed number of centroids
+
+Functions:
+implicit.py returns the grid Fourier and Biot numbers and the batch solver
+uq <- implicit <- tridiag
+
+References:
+1) Papadikis 2010a
+2) Chan, Golub, LeVeque 1983, Algorithms for computing the sample variance
+3) Dunning, Ertl 2019, Computing extremely accurate quantiles using t-digests
+"""
+
+# Modules and Other Required Functions
+# -----------------------------------------------------------------------------
+
+import numpy as np
+from scipy.stats import qmc
+from implicit import params, solve
+
+# Parameters from Papadikis 2010a Table 1 used when not sampled
+base = {'rho': 700, 'cp': 1500, 'k': 0.105, 'h': 375, 'd': 0.035e-2}
+
+# Streaming Estimators
+# -----------------------------------------------------------------------------
+
+class Welford:
+    """
+    Running mean and variance of arrays with a fixed shape. Each update takes
+    a batch of samples along the first axis.
+    """
+
+    def __init__(self, shape):
+        self.n = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)   # sum of squared deviations from the mean
+
+    def update(self, x):
+        nb = len(x)
+        mb = x.mean(axis=0)
+        m2b = ((x - mb)**2).sum(axis=0)
+        n = self.n + nb
+        delta = mb - self.mean
+        self.mean = self.mean + delta*nb/n
+        self.m2 = self.m2 + m2b + delta**2 * self.n*nb/n
+        self.n = n
+
+    def var(self, ddof=1):
+        return self.m2 / max(self.n - ddof, 1)
+
+
+class TDigest:
+    """
+    Merging t-digest for the quantiles of arrays with a fixed shape, one digest
+    per element. Every element sees the same total weight so the centroid
+    boundaries from the k1 scale function are shared by all elements and the
+    merge is vectorized. Samples are split across boundaries by weight, which
+    keeps exactly delta centroids per element.
+    delta = number of centroids, larger is more accurate at a cost in memory
+    """
+
+    def __init__(self, shape, delta=100):
+        self.delta = delta
+        self.w = 0.0
+        self.means = np.zeros((0,) + tuple(np.atleast_1d(shape)))
+        self.lo = np.full(shape, np.inf)
+        self.hi = np.full(shape, -np.inf)
+
+        # centroid boundaries in q from the k1 scale function, finer at tails
+        j = np.arange(delta + 1)
+        self.qb = (1 + np.sin(np.pi*(j/delta - 0.5))) / 2
+
+    def update(self, x):
+        nb = len(x)
+        self.lo = np.minimum(self.lo, x.min(axis=0))
+        self.hi = np.maximum(self.hi, x.max(axis=0))
+
+        # current centroids and new samples with their weights
+        wc = np.diff(self.qb)*self.w if len(self.means) else np.zeros(0)
+        v = np.concatenate((self.means, x))
+        w = np.concatenate((wc, np.ones(nb)))
+        w = np.broadcast_to(w.reshape((-1,) + (1,)*(v.ndim - 1)), v.shape)
+
+        # sort each element by value and integrate value over the weight
+        idx = np.argsort(v, axis=0)
+        v = np.take_along_axis(v, idx, axis=0)
+        w = np.take_along_axis(w, idx, axis=0)
+        wcum = np.cumsum(w, axis=0)
+        scum = np.cumsum(w*v, axis=0)
+
+        self.w = self.w + nb
+        bounds = self.qb*self.w
+
+        # integral of value up to each boundary, interpolated within an item
+        s = np.zeros((len(bounds),) + v.shape[1:])
+        for j, B in enumerate(bounds[1:], start=1):
+            k = np.minimum((wcum < B*(1 - 1e-12)).sum(axis=0), len(v) - 1)
+            k = k[np.newaxis]
+            wk = np.take_along_axis(wcum, k, axis=0)[0]
+            sk = np.take_along_axis(scum, k, axis=0)[0]
+            vk = np.take_along_axis(v, k, axis=0)[0]
+            s[j] = sk - (wk - B)*vk
+
+        self.means = np.diff(s, axis=0) / np.diff(bounds).reshape(
+            (-1,) + (1,)*(v.ndim - 1))
+
+    def quantile(self, q):
+        """
+        Returns the q-th quantiles, 0 <= q <= 1, with q along the first axis.
+        """
+        qc = (self.qb[:-1] + self.qb[1:]) / 2    # centroid centers in q
+        qq = np.concatenate(([0.0], qc, [1.0]))
+        vv = np.concatenate((self.lo[np.newaxis], self.means,
+                             self.hi[np.newaxis]))
+        q = np.atleast_1d(q)
+
+        # linear interpolation in q between centroid centers
+        k = np.clip(np.searchsorted(qq, q, side='right') - 1, 0, len(qq) - 2)
+        f = (q - qq[k]) / (qq[k+1] - qq[k])
+        f = f.reshape((-1,) + (1,)*(vv.ndim - 1))
+        return vv[k] + f*(vv[k+1] - vv[k])
+
+# Sampling
+# -----------------------------------------------------------------------------
+
+def sampler(dists, method='lhs', seed=None):
+    """
+    Returns a function that draws n samples of the uncertain parameters as a
+    dictionary of arrays. Uniform samples from the sequence are mapped through
+    the inverse cdf (ppf) of each distribution.
+    dists = dictionary of parameter name and frozen scipy.stats distribution
+    method = 'lhs' for Latin hypercube or 'sobol' for a scrambled Sobol
+             sequence
+    seed = random seed
+    """
+    names = list(dists)
+    if method == 'lhs':
+        eng = qmc.LatinHypercube(d=len(names), seed=seed)
+    elif method == 'sobol':
+        eng = qmc.Sobol(d=len(names), seed=seed)
+    else:
+        raise ValueError("method must be 'lhs' or 'sobol'")
+
+    def draw(n):
+        u = eng.random(n)
+        return {p: dists[p].ppf(u[:, j]) for j, p in enumerate(names)}
+
+    return draw
+
+# Monte Carlo Driver
+# -----------------------------------------------------------------------------
+
+def run(dists, nsamples, b=2, Ti=300, Tinf=773, tmax=0.8, nt=1000, nr=99,
+        batch=256, method='lhs', seed=None, q=(0.05, 0.5, 0.95), delta=100):
+    """
+    Returns a dictionary of mean, var and quantiles (with q along the first
+    axis) of the center and surface temperature histories, each with nt+1
+    time steps. Parameters not in dists use the Papadikis 2010a values in base.
+    dists = dictionary of parameter name (rho, cp, k, h, d) and distribution
+    nsamples = total number of samples
+    b = shape factor where 2 sphere, 1 cylinder
+    batch = number of particles solved together
+    method = 'lhs' or 'sobol', Sobol is best with batch as a power of 2
+    """
+    m = nr+1
+    draw = sampler(dists, method, seed)
+    mom = Welford((2, nt+1))
+    dig = TDigest((2, nt+1), delta)
+
+    done = 0
+    while done < nsamples:
+        n = min(batch, nsamples - done)
+        p = dict(base)
+        p.update(draw(n))
+        Fo, Bi, dt = params(p['rho'], p['cp'], p['k'], p['h'], p['d'],
+                            tmax, nt, nr)
+        Fo, Bi = np.broadcast_arrays(Fo, Bi)
+        TT = solve(b, Fo, Bi, Ti, Tinf, m, nt)     # (nt+1, m, n)
+
+        # center and surface histories as (n, 2, nt+1)
+        x = np.stack((TT[:, 0], TT[:, m-1])).transpose(2, 0, 1)
+        mom.update(x)
+        dig.update(x)
+        done = done + n
+
+    var = mom.var()
+    qs = dig.quantile(q)
+    return {'t': np.linspace(0, tmax, nt+1), 'n': done, 'q': np.asarray(q),
+            'mean_center': mom.mean[0], 'mean_surface': mom.mean[1],
+            'var_center': var[0], 'var_surface': var[1],
+            'quantile_center': qs[:, 0], 'quantile_surface': qs[:, 1]}